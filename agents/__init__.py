@@ -1,14 +1,21 @@
-# Import all agents to make them easily accessible
-from .supervisor import JobAssistantSupervisor
-from .job_search import JobSearchAgent
-from .resume_analyzer import ResumeAnalyzerAgent
-from .cover_letter_generator import CoverLetterAgent
-from .web_researcher import ScrapyWebResearchAgent
-
-__all__ = [
-    'JobAssistantSupervisor',
-    'JobSearchAgent',
-    'ResumeAnalyzerAgent',
-    'CoverLetterAgent',
-    'ScrapyWebResearchAgent'
-]
\ No newline at end of file
+# Agents are imported on first access so that using one agent does not
+# pull in the dependencies of all the others
+import importlib
+
+_AGENT_MODULES = {
+    'JobAssistantSupervisor': '.supervisor',
+    'JobSearchAgent': '.job_search',
+    'ResumeAnalyzerAgent': '.resume_analyzer',
+    'CoverLetterAgent': '.cover_letter_generator',
+    'WebResearchAgent': '.web_researcher',
+    'ScrapyWebResearchAgent': '.web_researcher'
+}
+
+__all__ = list(_AGENT_MODULES)
+
+
+def __getattr__(name):
+    if name in _AGENT_MODULES:
+        module = importlib.import_module(_AGENT_MODULES[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -0,0 +1,72 @@
+from typing import Tuple
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # JIT compilation is optional; numpy is used otherwise
+    numba = None
+
+
+def _cosine_scores_numpy(query: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    """Vectorized numpy fallback for the cosine similarity kernel"""
+    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+    scores = matrix @ query
+    return np.divide(scores, norms, out=np.zeros_like(scores), where=norms > 0)
+
+
+if numba is not None:
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _cosine_scores_parallel(query, matrix):
+        query_norm = 0.0
+        for j in range(query.shape[0]):
+            query_norm += query[j] * query[j]
+        query_norm = np.sqrt(query_norm)
+
+        scores = np.zeros(matrix.shape[0], dtype=np.float32)
+        for i in numba.prange(matrix.shape[0]):
+            dot = 0.0
+            row_norm = 0.0
+            for j in range(matrix.shape[1]):
+                dot += query[j] * matrix[i, j]
+                row_norm += matrix[i, j] * matrix[i, j]
+            denominator = np.sqrt(row_norm) * query_norm
+            if denominator > 0.0:
+                scores[i] = dot / denominator
+        return scores
+else:
+    _cosine_scores_parallel = None
+
+
+def cosine_topk(query: np.ndarray, matrix: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the rows of a matrix most similar to a query vector
+
+    Args:
+        query (np.ndarray): Query vector of shape [D]
+        matrix (np.ndarray): Matrix of shape [N, D]
+        k (int): Number of rows to return
+
+    Returns:
+        Tuple of row indices and their cosine similarities, most similar first
+    """
+    query = np.ascontiguousarray(query, dtype=np.float32)
+    matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+    if _cosine_scores_parallel is not None:
+        scores = _cosine_scores_parallel(query, matrix)
+    else:
+        scores = _cosine_scores_numpy(query, matrix).astype(np.float32, copy=False)
+
+    k = min(k, scores.shape[0])
+    if k <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+    # Partial selection, then order only the k winners
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top])]
+    return top, scores[top]
+
+
+def warm_up():
+    """Compile the JIT kernel ahead of the first real query"""
+    if _cosine_scores_parallel is not None:
+        cosine_topk(np.ones(2, dtype=np.float32), np.ones((1, 2), dtype=np.float32), 1)
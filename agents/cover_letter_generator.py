@@ -4,25 +4,80 @@ from typing import Dict, Any
 
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import PromptTemplate
-from langchain_core.output_parsers import PydanticOutputParser
 from pydantic import BaseModel, Field
 
+from .store import ContentStore, content_key
+
 class CoverLetterContent(BaseModel):
     opening_paragraph: str = Field(description="Engaging opening paragraph")
     skills_paragraph: str = Field(description="Paragraph highlighting relevant skills")
     motivation_paragraph: str = Field(description="Paragraph explaining motivation")
     closing_paragraph: str = Field(description="Strong closing paragraph")
 
+# Context shared by every paragraph prompt, kept first so the prompts share a prefix
+_LETTER_CONTEXT = """
+        You are writing one paragraph of a professional cover letter.
+        
+        Candidate Resume Details:
+        Skills: {skills}
+        Experience: {experience}
+        Education: {education}
+        
+        Job Description:
+        {job_description}
+        
+        """
+
+_LETTER_VARIABLES = ["job_description", "skills", "experience", "education"]
+
 class CoverLetterAgent:
-    def __init__(self, llm: ChatOpenAI):
+    # One prompt per paragraph so the paragraphs can be generated concurrently
+    OPENING_PROMPT = PromptTemplate(
+        template=_LETTER_CONTEXT + "Write a compelling opening paragraph. Return only the paragraph text.",
+        input_variables=_LETTER_VARIABLES
+    )
+    SKILLS_PROMPT = PromptTemplate(
+        template=_LETTER_CONTEXT + "Write a paragraph showcasing the candidate's skills relevant to this job. Return only the paragraph text.",
+        input_variables=_LETTER_VARIABLES
+    )
+    MOTIVATION_PROMPT = PromptTemplate(
+        template=_LETTER_CONTEXT + "Write a paragraph explaining the candidate's motivation for the role. Return only the paragraph text.",
+        input_variables=_LETTER_VARIABLES
+    )
+    CLOSING_PROMPT = PromptTemplate(
+        template=_LETTER_CONTEXT + "Write a strong closing paragraph. Return only the paragraph text.",
+        input_variables=_LETTER_VARIABLES
+    )
+    PARAGRAPH_PROMPTS = {
+        "opening_paragraph": OPENING_PROMPT,
+        "skills_paragraph": SKILLS_PROMPT,
+        "motivation_paragraph": MOTIVATION_PROMPT,
+        "closing_paragraph": CLOSING_PROMPT
+    }
+
+    def __init__(self, llm: ChatOpenAI, store: ContentStore = None):
         """
         Initialize Cover Letter Generator Agent
         
         Args:
             llm (ChatOpenAI): Language model for generation
+            store (ContentStore, optional): Persistent store for generated cover letters
         """
         self.llm = llm
         self.logger = logging.getLogger(__name__)
+        self.store = store or ContentStore("cover_letters")
+        
+        # Resume details keyed by resume content hash
+        self._resume_details_cache: Dict[str, Dict[str, str]] = {}
+        self._analyzer = None
+    
+    @property
+    def analyzer(self):
+        """Resume analyzer shared across cover letter requests, created on first use"""
+        if self._analyzer is None:
+            from .resume_analyzer import ResumeAnalyzerAgent
+            self._analyzer = ResumeAnalyzerAgent(self.llm)
+        return self._analyzer
     
     def process(self, query: str, resume_path: str = None) -> Dict[str, Any]:
         """
@@ -80,18 +135,24 @@ class CoverLetterAgent:
         Returns:
             Dict with resume key details
         """
-        # This is a placeholder. In a real implementation, 
-        # you'd use the ResumeAnalyzerAgent to extract details
-        from .resume_analyzer import ResumeAnalyzerAgent
+        from .resume_analyzer import resume_digest
+        
+        resume_hash = resume_digest(resume_path)
+        if resume_hash in self._resume_details_cache:
+            return self._resume_details_cache[resume_hash]
         
-        analyzer = ResumeAnalyzerAgent(self.llm)
-        resume_insights = analyzer.analyze_resume(resume_path)
+        resume_insights = self.analyzer.analyze_resume(resume_path)
         
-        return {
-            "skills": resume_insights.get("Key Skills", ""),
-            "experience": resume_insights.get("Experience Summary", ""),
-            "education": resume_insights.get("Education Level", "")
+        profile = resume_insights.get("Current_Profile", {})
+        skills = profile.get("Key_Skills", [])
+        resume_details = {
+            "skills": ", ".join(skills) if isinstance(skills, list) else skills,
+            "experience": profile.get("Experience_Summary", ""),
+            "education": profile.get("Education_Level", "")
         }
+        if "error" not in resume_insights:
+            self._resume_details_cache[resume_hash] = resume_details
+        return resume_details
     
     def generate_cover_letter(self, job_description: str, resume_path: str) -> Dict[str, Any]:
         """
@@ -104,51 +165,34 @@ class CoverLetterAgent:
         Returns:
             Dict with cover letter content and metadata
         """
-        # Extract resume details
-        resume_details = self._extract_resume_details(resume_path)
+        from .resume_analyzer import resume_digest
         
-        # Create output parser
-        parser = PydanticOutputParser(pydantic_object=CoverLetterContent)
+        # Identical job description and resume pairs reuse the stored letter
+        normalized_description = " ".join(job_description.lower().split())
+        store_key = content_key(normalized_description, resume_digest(resume_path))
+        stored_letter = self.store.get(store_key)
+        if stored_letter is not None:
+            return stored_letter
         
-        # Create comprehensive prompt
-        prompt = PromptTemplate(
-            template="""
-            Generate a professional cover letter based on:
-            
-            Job Description:
-            {job_description}
-            
-            Candidate Resume Details:
-            Skills: {skills}
-            Experience: {experience}
-            Education: {education}
-            
-            Generate a cover letter with:
-            1. A compelling opening paragraph
-            2. A paragraph showcasing relevant skills
-            3. A paragraph explaining motivation for the role
-            4. A strong closing paragraph
-            
-            {format_instructions}
-            """,
-            input_variables=[
-                "job_description", "skills", "experience", "education"
-            ],
-            partial_variables={
-                "format_instructions": parser.get_format_instructions()
-            }
-        )
+        # Extract resume details
+        resume_details = self._extract_resume_details(resume_path)
         
-        # Generate chain
-        chain = prompt | self.llm | parser
+        prompt_values = {
+            "job_description": job_description,
+            "skills": resume_details["skills"],
+            "experience": resume_details["experience"],
+            "education": resume_details["education"]
+        }
         
         try:
-            # Generate cover letter
-            cover_letter_content = chain.invoke({
-                "job_description": job_description,
-                "skills": resume_details["skills"],
-                "experience": resume_details["experience"],
-                "education": resume_details["education"]
+            # Generate all paragraphs concurrently
+            responses = self.llm.batch(
+                [prompt.format(**prompt_values) for prompt in self.PARAGRAPH_PROMPTS.values()],
+                config={"max_concurrency": len(self.PARAGRAPH_PROMPTS)}
+            )
+            cover_letter_content = CoverLetterContent(**{
+                field: response.content.strip()
+                for field, response in zip(self.PARAGRAPH_PROMPTS, responses)
             })
             
             # Combine paragraphs
@@ -159,7 +203,7 @@ class CoverLetterAgent:
                 cover_letter_content.closing_paragraph
             ])
             
-            return {
+            result = {
                 "status": "success",
                 "content": full_cover_letter,
                 "paragraphs": {
@@ -169,6 +213,8 @@ class CoverLetterAgent:
                     "closing": cover_letter_content.closing_paragraph
                 }
             }
+            self.store.set(store_key, result)
+            return result
         
         except Exception as e:
             self.logger.error(f"Cover letter generation error: {e}")
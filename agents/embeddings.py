@@ -0,0 +1,173 @@
+import os
+import time
+import queue
+import logging
+import importlib.util
+import threading
+from concurrent.futures import Future
+from functools import lru_cache
+from typing import List, Optional
+
+import numpy as np
+
+# Embedding-based matching is optional; sentence-transformers pulls in torch, so it is
+# only imported when the model is first needed
+EMBEDDINGS_AVAILABLE = importlib.util.find_spec("sentence_transformers") is not None
+
+EMBEDDING_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
+# "onnx" runs the model's int8-quantized ONNX export on CPU instead of PyTorch
+EMBEDDING_BACKEND = os.getenv('CAREERSTACK_EMBEDDING_BACKEND', 'torch')
+ONNX_QUANTIZED_FILE = "onnx/model_qint8_avx2.onnx"
+
+logger = logging.getLogger(__name__)
+
+# Shared model instance; False once loading has failed so it is not retried
+_embedder = None
+_embedder_lock = threading.Lock()
+
+
+def _load_model():
+    """Load the embedding model with the lightest weights the hardware supports"""
+    from sentence_transformers import SentenceTransformer
+
+    if EMBEDDING_BACKEND == 'onnx':
+        try:
+            return SentenceTransformer(
+                EMBEDDING_MODEL_NAME, backend='onnx', model_kwargs={'file_name': ONNX_QUANTIZED_FILE}
+            )
+        except Exception as e:
+            logger.warning(f"Could not load quantized ONNX embedding model, using PyTorch: {e}")
+
+    model = SentenceTransformer(EMBEDDING_MODEL_NAME)
+    if model.device.type == 'cuda':
+        # Half-precision weights halve GPU memory and run on tensor cores
+        model.half()
+    return model
+
+
+def get_embedder():
+    """
+    Load the shared sentence embedding model on first use
+
+    Returns:
+        SentenceTransformer, or None if embeddings are unavailable
+    """
+    global _embedder
+    if _embedder is None:
+        # The batcher thread and request threads may ask at once; load the model only once
+        with _embedder_lock:
+            if _embedder is None:
+                if not EMBEDDINGS_AVAILABLE:
+                    _embedder = False
+                else:
+                    try:
+                        _embedder = _load_model()
+                    except Exception as e:
+                        logger.warning(f"Could not load embedding model {EMBEDDING_MODEL_NAME}: {e}")
+                        _embedder = False
+    return _embedder or None
+
+
+def embed_texts(texts: List[str], batch_size: int = 32) -> Optional[np.ndarray]:
+    """
+    Embed a batch of texts in a single model call
+
+    Args:
+        texts (List[str]): Texts to embed
+        batch_size (int): Number of texts per forward pass
+
+    Returns:
+        float32 array of unit-length embeddings, one row per text,
+        or None if embeddings are unavailable
+    """
+    embedder = get_embedder()
+    if embedder is None:
+        return None
+    embeddings = embedder.encode(
+        texts, batch_size=batch_size, normalize_embeddings=True, convert_to_numpy=True
+    )
+    return embeddings.astype(np.float32, copy=False)
+
+
+class EmbedBatcher:
+    def __init__(self, max_wait: float = 0.01, batch_size: int = 32):
+        """
+        Collect single-text embedding requests from concurrent callers into batched model calls
+
+        Args:
+            max_wait (float): Seconds to wait for more requests after the first one arrives
+            batch_size (int): Maximum number of texts per model call
+        """
+        self.max_wait = max_wait
+        self.batch_size = batch_size
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._worker = None
+        self._lock = threading.Lock()
+
+    def submit(self, text: str) -> Future:
+        """Queue a text for embedding, starting the worker thread on first use"""
+        if self._worker is None:
+            with self._lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._run, name="embed-batcher", daemon=True)
+                    self._worker.start()
+        future = Future()
+        self._queue.put((text, future))
+        return future
+
+    def embed(self, text: str) -> Optional[np.ndarray]:
+        """Embed a text, blocking until its batch has been encoded"""
+        return self.submit(text).result()
+
+    def _next_batch(self) -> list:
+        """Wait for a request, then gather more until the batch is full or max_wait has passed"""
+        batch = [self._queue.get()]
+        # A lone caller is encoded at once rather than after the batching window
+        deadline = time.monotonic() if self._queue.empty() else time.monotonic() + self.max_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return [(text, future) for text, future in batch if future.set_running_or_notify_cancel()]
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                continue
+            try:
+                embeddings = embed_texts([text for text, _ in batch], batch_size=self.batch_size)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for index, (_, future) in enumerate(batch):
+                future.set_result(None if embeddings is None else embeddings[index])
+
+
+# Shared batcher so concurrent requests are encoded together
+_batcher = EmbedBatcher()
+
+
+@lru_cache(maxsize=1000)
+def embed_text(text: str) -> Optional[np.ndarray]:
+    """
+    Embed a single text, memoized for repeated texts
+
+    Args:
+        text (str): Text to embed
+
+    Returns:
+        Read-only float32 unit-length embedding, or None if embeddings are unavailable
+    """
+    embedding = _batcher.embed(text)
+    if embedding is None:
+        return None
+    # Cached arrays are shared between callers
+    embedding.setflags(write=False)
+    return embedding
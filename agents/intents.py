@@ -0,0 +1,60 @@
+import re
+from functools import lru_cache
+from typing import Tuple
+
+# Keywords that route a query to each intent, checked in order
+INTENT_KEYWORDS = {
+    "job_search": ["job", "position", "career", "opportunity", "roles"],
+    "cover_letter": ["cover letter", "application", "recommendation", "letter"],
+    "resume": ["resume", "cv", "skill", "experience", "profile"],
+    "research": ["research", "information", "learn", "find out", "details"],
+}
+
+# Intents whose keywords also turn up in requests of another intent; a cover letter
+# request names the job it is for, skills or experience describe a job search, and
+# words like "learn" or "details" only start a crawl when nothing else matched
+SUPPRESSED_INTENTS = {
+    "cover_letter": ("job_search", "resume", "research"),
+    "job_search": ("resume", "research"),
+    "resume": ("research",),
+}
+
+# Every keyword in one pattern, with a named group per intent; the lookahead
+# lets a single scan report keywords of all intents, even where they overlap
+_INTENT_PATTERN = re.compile(
+    "(?=" + "|".join(
+        f"(?P<{intent}>{'|'.join(map(re.escape, keywords))})" for intent, keywords in INTENT_KEYWORDS.items()
+    ) + ")",
+    re.IGNORECASE
+)
+
+# Queries longer than this are classified directly rather than memoized
+MAX_CACHED_QUERY_CHARS = 512
+
+
+def _matched_intents(query_lower: str) -> Tuple[str, ...]:
+    """Intents with a keyword in the query, in INTENT_KEYWORDS order, less those another match suppresses"""
+    found = {match.lastgroup for match in _INTENT_PATTERN.finditer(query_lower)}
+    for intent in list(found):
+        found.difference_update(SUPPRESSED_INTENTS.get(intent, ()))
+    return tuple(intent for intent in INTENT_KEYWORDS if intent in found)
+
+
+# Memoized for repeated queries
+_matched_intents_cached = lru_cache(maxsize=4096)(_matched_intents)
+
+
+def matched_intents(query: str) -> Tuple[str, ...]:
+    """
+    Find the intents a query asks for
+
+    Args:
+        query (str): User input query
+
+    Returns:
+        Matched intents in INTENT_KEYWORDS order, empty if none matched
+    """
+    query_lower = query.lower()
+    if len(query_lower) > MAX_CACHED_QUERY_CHARS:
+        return _matched_intents(query_lower)
+    return _matched_intents_cached(query_lower)
@@ -1,14 +1,31 @@
 import os
+import re
+import html
+import json
+import heapq
+import asyncio
+import functools
 import logging
-from typing import Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Pattern, Tuple
+import aiohttp
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from langchain_groq import ChatGroq
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import PydanticOutputParser
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+from .embeddings import embed_texts
+from .llm import LLM_TIMEOUT, ainvoke_in_thread
+from .store import ContentStore, content_key
 
 # Define models for job listings and search results
 class JobListing(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='ignore', str_strip_whitespace=True)
+
     title: str = Field(description="Job title")
     company: str = Field(description="Company name")
     location: str = Field(description="Job location")
@@ -17,15 +34,85 @@ class JobListing(BaseModel):
     description: str = Field(description="Brief job description")
     salary_range: str = Field(description="Estimated salary range", default="Not provided")
     application_link: str = Field(description="Job application URL", default="")
+    matching_skills: List[str] = Field(description="Candidate skills mentioned in the posting", default_factory=list)
 
 class JobSearchResults(BaseModel):
-    listings: List[JobListing] = Field(description="List of job listings")
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
+    listings: Tuple[JobListing, ...] = Field(description="List of job listings")
     total_results: int = Field(description="Total number of job listings found")
     search_parameters: Dict[str, Any] = Field(description="Parameters used in the job search")
 
+# Minimum cosine similarity for a skill to count as matching a job description
+SKILL_MATCH_THRESHOLD = 0.5
+
+# Query enhancement skips the LLM for queries longer than this, or that mention
+# one of the candidate's top FAST_PATH_SKILLS skills
+FAST_PATH_MAX_QUERY_WORDS = 12
+FAST_PATH_SKILLS = 5
+
+# Stored search results are reused for this many seconds before refetching
+SEARCH_RESULTS_TTL = 6 * 60 * 60
+
+# Job descriptions are trimmed to this many characters; enough signal for matching
+MAX_DESCRIPTION_CHARS = 1500
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+def _html_to_text(markup: str) -> str:
+    """
+    Convert an HTML job description to plain text
+    
+    Args:
+        markup (str): Raw description, possibly containing HTML
+    
+    Returns:
+        str: Plain text description truncated to MAX_DESCRIPTION_CHARS
+    """
+    text = html.unescape(_TAG_RE.sub(' ', markup))
+    return _WHITESPACE_RE.sub(' ', text).strip()[:MAX_DESCRIPTION_CHARS]
+
+def _requirements_list(job: Dict[str, Any]) -> List[str]:
+    """Return a job's requirements as a list, whether the API sent a list or a string"""
+    requirements = job.get('requirements') or []
+    return [requirements] if isinstance(requirements, str) else requirements
+
+# (connect, read) timeouts for job API requests
+FETCH_TIMEOUT = (3, 7)
+
+def _create_session() -> requests.Session:
+    """Create the pooled HTTP session shared by every JobSearchAgent"""
+    session = requests.Session()
+    # Two retries keep one failing API from holding up the whole fan-out
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        max_retries=Retry(total=2, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+_SESSION = _create_session()
+
+# Prompt for LLM to create an enhanced query
+_QUERY_ENHANCEMENT_PROMPT = PromptTemplate(
+    template="""Enhance a job search query based on a candidate's profile.
+    Return the enhanced search query.
+    Candidate Profile:
+    - Key Skills: {key_skills}
+    - Experience Summary: {experience_summary}
+    - Career Objectives: {career_objectives}
+    - Recommended Job Titles: {recommended_job_titles}
+    Original Query: {base_query}""",
+    input_variables=["key_skills", "experience_summary", "career_objectives", "recommended_job_titles", "base_query"]
+)
+
 # Define the JobSearchAgent class
 class JobSearchAgent:
-    def __init__(self, llm: ChatGroq = None, api_key: str = None, temperature: float = 0.7, resume_analyzer=None):
+    def __init__(self, llm: ChatGroq = None, api_key: str = None, temperature: float = 0.7, resume_analyzer=None,
+                 store: ContentStore = None, always_enhance: bool = False):
         """
         Initialize Job Search Agent
         
@@ -34,25 +121,44 @@ class JobSearchAgent:
             api_key (str, optional): Groq API key
             temperature (float, optional): Creativity/randomness of model responses
             resume_analyzer: Optional ResumeAnalyzerAgent instance
+            store (ContentStore, optional): Persistent store for search results
+            always_enhance (bool, optional): Always rewrite queries with the LLM, skipping the fast path
         """
-        # Initialize LLM
+        # Use provided LLM, or validate the API key now and create the client on first use
         if llm is None:
             api_key = api_key or os.getenv('GROQ_API_KEY')
             if not api_key:
                 raise ValueError("Groq API key must be provided either as an argument or via GROQ_API_KEY environment variable")
-            self.llm = ChatGroq(temperature=temperature, groq_api_key=api_key, model_name="llama3-70b-8192")
         else:
             self.llm = llm
+        self._api_key = api_key
+        self._temperature = temperature
 
         self.logger = logging.getLogger(__name__)
         self.resume_analyzer = resume_analyzer  # Optional ResumeAnalyzerAgent
+        self.store = store or ContentStore("job_searches")
+        self.always_enhance = always_enhance
         self.resume_context = None  # Placeholder for resume analysis
+        self._profile_prompt_values: Dict[str, str] = {}
+        self._skill_lookup: Dict[str, str] = {}
+        self._skill_pattern = None
+        self._skill_embeddings = None
+        self._enhanced_query_cache: Dict[str, str] = {}
         self.job_search_apis = [
             "https://jobs.github.com/positions.json",
             "https://authenticjobs.com/api/", 
             "https://jobs.stackoverflow.com/api"
         ]
 
+        # Share the module-wide connection pool across agents
+        self.session = _SESSION
+
+    @functools.cached_property
+    def llm(self) -> ChatGroq:
+        """Groq client, created on first use when no LLM was injected"""
+        return ChatGroq(temperature=self._temperature, groq_api_key=self._api_key, model_name="llama3-70b-8192",
+                        request_timeout=LLM_TIMEOUT)
+
     def set_resume_context(self, resume_analysis: Dict[str, Any]):
         """
         Set resume context for personalized job searching
@@ -70,6 +176,53 @@ class JobSearchAgent:
             'skill_gaps': resume_analysis.get('Development_Areas', {}).get('Skill_Gaps', {})
         }
 
+        # Derive per-resume strings once so every search reuses them verbatim
+        self._profile_prompt_values = {
+            "key_skills": ", ".join(self.resume_context['key_skills']),
+            "experience_summary": self.resume_context['experience_summary'],
+            "career_objectives": self.resume_context['career_objectives'],
+            "recommended_job_titles": ", ".join(self.resume_context['recommended_job_titles'])
+        }
+        self._skill_lookup = {
+            skill.strip().lower(): skill.strip() for skill in self.resume_context['key_skills'] if skill and skill.strip()
+        }
+        self._skill_pattern = None
+        if self._skill_lookup:
+            alternation = "|".join(map(re.escape, sorted(self._skill_lookup, key=len, reverse=True)))
+            self._skill_pattern = re.compile(rf"(?<!\w)(?:{alternation})(?!\w)", re.IGNORECASE)
+
+        # Embed the skill vocabulary once; None when embeddings are unavailable
+        self._skill_embeddings = embed_texts(list(self._skill_lookup.values())) if self._skill_lookup else None
+
+        # Enhanced queries depend on the resume, so start afresh for a new one
+        self._enhanced_query_cache = {}
+
+    def _fast_path_query(self, base_query: str) -> Optional[str]:
+        """
+        Enrich a query without the LLM when it is already specific enough
+        
+        Args:
+            base_query (str): Initial job search query
+        
+        Returns:
+            str: Enriched query, or None if the query needs LLM enhancement
+        """
+        # Queries that already mention the candidate's skills, or are detailed
+        # enough on their own, are enriched without an LLM round-trip
+        top_skills = self.resume_context.get('key_skills', [])[:FAST_PATH_SKILLS]
+        # Whole-word matches only, so "Java" is not found in "JavaScript" nor "R" in "Remote"
+        mentioned = (
+            {match.group(0).lower() for match in self._skill_pattern.finditer(base_query)}
+            if self._skill_pattern is not None else set()
+        )
+        if not self.always_enhance and (
+            any(skill.strip().lower() in mentioned for skill in top_skills)
+            or len(base_query.split()) > FAST_PATH_MAX_QUERY_WORDS
+        ):
+            extra_skills = [skill for skill in top_skills if skill.strip().lower() not in mentioned][:3]
+            return " ".join([base_query, *extra_skills])
+        return None
+
     def _generate_advanced_search_query(self, base_query: str) -> str:
         """
         Generate enhanced job search query using resume context
@@ -83,37 +236,129 @@ class JobSearchAgent:
         if not self.resume_context:
             return base_query
 
-        # Prompt for LLM to create an enhanced query
-        query_enhancement_prompt = PromptTemplate(
-            template="""Enhance a job search query based on a candidate's profile:
-            Candidate Profile:
-            - Key Skills: {key_skills}
-            - Experience Summary: {experience_summary}
-            - Career Objectives: {career_objectives}
-            - Recommended Job Titles: {recommended_job_titles}
-            Original Query: {base_query}
-            Return the enhanced search query.""",
-            input_variables=["key_skills", "experience_summary", "career_objectives", "recommended_job_titles", "base_query"]
-        )
+        fast_query = self._fast_path_query(base_query)
+        if fast_query is not None:
+            return fast_query
 
-        enhanced_query_chain = query_enhancement_prompt | self.llm
+        # Queries differing only in case or spacing share one enhancement
+        cache_key = " ".join(base_query.lower().split())
+        if cache_key in self._enhanced_query_cache:
+            return self._enhanced_query_cache[cache_key]
+
+        enhanced_query_chain = _QUERY_ENHANCEMENT_PROMPT | self.llm
 
         try:
             enhanced_query_result = enhanced_query_chain.invoke({
-                "key_skills": ", ".join(self.resume_context.get('key_skills', [])),
-                "experience_summary": self.resume_context.get('experience_summary', ''),
-                "career_objectives": self.resume_context.get('career_objectives', ''),
-                "recommended_job_titles": ", ".join(self.resume_context.get('recommended_job_titles', [])),
+                **self._profile_prompt_values,
                 "base_query": base_query
             })
-            return enhanced_query_result.content.strip()
+            enhanced_query = enhanced_query_result.content.strip()
+            self._enhanced_query_cache[cache_key] = enhanced_query
+            return enhanced_query
         except Exception as e:
             self.logger.warning(f"Query enhancement failed: {e}")
             return base_query
 
+    async def _agenerate_advanced_search_query(self, base_query: str) -> str:
+        """
+        Generate enhanced job search query without blocking the event loop
+        
+        Args:
+            base_query (str): Initial job search query
+        
+        Returns:
+            str: Enriched search query
+        """
+        if not self.resume_context:
+            return base_query
+
+        fast_query = self._fast_path_query(base_query)
+        if fast_query is not None:
+            return fast_query
+
+        cache_key = " ".join(base_query.lower().split())
+        if cache_key in self._enhanced_query_cache:
+            return self._enhanced_query_cache[cache_key]
+
+        enhanced_query_chain = _QUERY_ENHANCEMENT_PROMPT | self.llm
+
+        try:
+            # The base query is used if the LLM has not answered within LLM_TIMEOUT seconds
+            enhanced_query_result = await ainvoke_in_thread(enhanced_query_chain, {
+                **self._profile_prompt_values,
+                "base_query": base_query
+            })
+            enhanced_query = enhanced_query_result.content.strip()
+            self._enhanced_query_cache[cache_key] = enhanced_query
+            return enhanced_query
+        except Exception as e:
+            self.logger.warning(f"Query enhancement failed: {e}")
+            return base_query
+
+    @staticmethod
+    def _deduplicate_listings(listings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Drop postings that appear more than once across job APIs
+        
+        Args:
+            listings (List[Dict]): Raw job listings
+        
+        Returns:
+            Listings with duplicates removed, keeping the first occurrence
+        """
+        def normalize(value: Any) -> str:
+            return " ".join(str(value or '').casefold().split())
+
+        seen = set()
+        unique_listings = []
+        for job in listings:
+            url = (job.get('url') or '').strip().rstrip('/')
+            key = url or (normalize(job.get('title')), normalize(job.get('company')), normalize(job.get('location')))
+            if key in seen:
+                continue
+            seen.add(key)
+            unique_listings.append(job)
+        return unique_listings
+
+    @staticmethod
+    def _extract_jobs(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Pull job listings out of an API response with descriptions as plain text
+        
+        Args:
+            payload (Dict): Decoded JSON response
+        
+        Returns:
+            List of job listings
+        """
+        jobs = payload.get('jobs', [])
+        return [
+            {**job, 'description': _html_to_text(job['description'])} if job.get('description') else job
+            for job in jobs
+        ]
+
+    def _fetch_from_api(self, api_url: str, query: str) -> List[Dict[str, Any]]:
+        """
+        Fetch job listings from a single external API
+        
+        Args:
+            api_url (str): Job search API endpoint
+            query (str): Job search query
+        
+        Returns:
+            List of job listings, empty if the API failed
+        """
+        try:
+            response = self.session.get(api_url, params={'description': query, 'location': 'remote'}, timeout=FETCH_TIMEOUT)
+            if response.status_code == 200:
+                return self._extract_jobs(response.json())
+        except Exception as e:
+            self.logger.warning(f"Error searching {api_url}: {e}")
+        return []
+
     def _fetch_job_listings(self, query: str) -> List[Dict[str, Any]]:
         """
-        Fetch job listings from external APIs
+        Fetch job listings from external APIs concurrently
         
         Args:
             query (str): Job search query
@@ -122,15 +367,164 @@ class JobSearchAgent:
             List of job listings
         """
         combined_listings = []
-        for api_url in self.job_search_apis:
-            try:
-                response = requests.get(api_url, params={'description': query, 'location': 'remote'})
-                if response.status_code == 200:
-                    listings = response.json().get('jobs', [])
-                    combined_listings.extend(listings)
-            except Exception as e:
-                self.logger.warning(f"Error searching {api_url}: {e}")
-        return combined_listings
+        with ThreadPoolExecutor(max_workers=len(self.job_search_apis)) as executor:
+            results = executor.map(lambda api_url: self._fetch_from_api(api_url, query), self.job_search_apis)
+            for listings in results:
+                combined_listings.extend(listings)
+        return self._deduplicate_listings(combined_listings)
+
+    async def _afetch_from_api(self, session: aiohttp.ClientSession, api_url: str, query: str) -> List[Dict[str, Any]]:
+        """
+        Fetch job listings from a single external API without blocking the event loop
+        
+        Args:
+            session (aiohttp.ClientSession): Shared HTTP session
+            api_url (str): Job search API endpoint
+            query (str): Job search query
+        
+        Returns:
+            List of job listings, empty if the API failed
+        """
+        try:
+            async with session.get(api_url, params={'description': query, 'location': 'remote'}) as response:
+                if response.status == 200:
+                    return self._extract_jobs(await response.json(content_type=None))
+        except Exception as e:
+            self.logger.warning(f"Error searching {api_url}: {e}")
+        return []
+
+    async def _afetch_job_listings(self, query: str) -> List[Dict[str, Any]]:
+        """
+        Fetch job listings from all external APIs concurrently
+        
+        Args:
+            query (str): Job search query
+        
+        Returns:
+            List of job listings
+        """
+        # Same connect and read limits as the requests-based path
+        timeout = aiohttp.ClientTimeout(sock_connect=FETCH_TIMEOUT[0], sock_read=FETCH_TIMEOUT[1])
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            results = await asyncio.gather(*(
+                self._afetch_from_api(session, api_url, query) for api_url in self.job_search_apis
+            ))
+        return self._deduplicate_listings([job for listings in results for job in listings])
+
+    @staticmethod
+    def _match_skills(job: Dict[str, Any], skill_pattern: Pattern, skill_lookup: Dict[str, str]) -> List[str]:
+        """
+        Find candidate skills mentioned in a job posting
+        
+        Args:
+            job (Dict): Raw job listing
+            skill_pattern (Pattern): Compiled alternation of candidate skills
+            skill_lookup (Dict): Lowercased skill -> skill as written in the resume
+        
+        Returns:
+            List of matched candidate skills, in order of first mention
+        """
+        text = " ".join([job.get('title') or '', job.get('description') or '', *_requirements_list(job)])
+        return list(dict.fromkeys(
+            skill_lookup[match.lower()] for match in skill_pattern.findall(text) if match.lower() in skill_lookup
+        ))
+
+    def _semantic_skill_matches(self, raw_listings: List[Dict[str, Any]]) -> Optional[List[List[str]]]:
+        """
+        Match candidate skills to job postings by embedding similarity
+        
+        Args:
+            raw_listings (List[Dict]): Raw job listings
+        
+        Returns:
+            Matched candidate skills per listing, or None when embeddings are unavailable
+        """
+        if self._skill_embeddings is None or not raw_listings:
+            return None
+
+        # One batched encode for every posting, then a single similarity matrix
+        description_embeddings = embed_texts([
+            f"{job.get('title') or ''} {job.get('description') or ''}" for job in raw_listings
+        ])
+        if description_embeddings is None:
+            return None
+        # Embeddings are unit length, so one matmul gives every posting-skill cosine similarity
+        similarities = description_embeddings @ self._skill_embeddings.T
+
+        skills = list(self._skill_lookup.values())
+        return [[skills[i] for i in np.flatnonzero(row > SKILL_MATCH_THRESHOLD)] for row in similarities]
+
+    @staticmethod
+    def _build_listing(job: Dict[str, Any], match_score: float, matching_skills: List[str]) -> JobListing:
+        """
+        Build a JobListing from a raw job
+        
+        Args:
+            job (Dict): Raw job listing
+            match_score (float): Match score for the listing
+            matching_skills (List[str]): Candidate skills found in the listing
+        
+        Returns:
+            JobListing, validated only when the source is marked untrusted
+        """
+        fields = dict(
+            title=job.get('title') or 'Untitled Position',
+            company=job.get('company') or 'Unknown Company',
+            location=job.get('location') or 'Remote/Unspecified',
+            match_score=match_score,
+            requirements=_requirements_list(job),
+            description=job.get('description') or 'No description available',
+            salary_range=job.get('salary') or 'Not provided',
+            application_link=job.get('url') or '',
+            matching_skills=matching_skills
+        )
+        if job.get('source_trusted') is False:
+            return JobListing(**fields)
+        return JobListing.model_construct(**fields)
+
+    def _store_key(self, query: str) -> str:
+        """Key stored results by the normalized query and the current resume profile"""
+        return content_key(
+            " ".join(query.lower().split()),
+            json.dumps(self._profile_prompt_values, sort_keys=True)
+        )
+
+    def _rank_listings(self, query: str, raw_listings: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Score raw listings against the resume and build the top results
+        
+        Args:
+            query (str): Original job search query
+            raw_listings (List[Dict]): Deduplicated raw job listings
+        
+        Returns:
+            Dict with job search results
+        """
+        # Score listings by how many of the candidate's key skills they mention
+        skill_pattern, skill_lookup = self._skill_pattern, self._skill_lookup
+        semantic_matches = self._semantic_skill_matches(raw_listings) if skill_pattern else None
+        scored_listings = []
+        for index, job in enumerate(raw_listings):
+            matching_skills = self._match_skills(job, skill_pattern, skill_lookup) if skill_pattern else []
+            if semantic_matches:
+                matching_skills = list(dict.fromkeys(matching_skills + semantic_matches[index]))
+            # Neutral score when there is no resume to match against
+            match_score = 100.0 * len(matching_skills) / len(skill_lookup) if skill_pattern else 50.0
+            scored_listings.append((match_score, matching_skills, job))
+
+        # Return top 10 listings by match score, building models only for those
+        top_listings = tuple(
+            self._build_listing(job, match_score, matching_skills)
+            for match_score, matching_skills, job in heapq.nlargest(10, scored_listings, key=lambda scored: scored[0])
+        )
+        return {
+            "status": "success",
+            "results": JobSearchResults(
+                listings=top_listings,
+                total_results=len(scored_listings),
+                search_parameters={"query": query, "resume_used": bool(self.resume_context)}
+            ).model_dump(mode='python')
+        }
 
     def process(self, query: str, resume_path: str = None) -> Dict[str, Any]:
         """
@@ -151,31 +545,64 @@ class JobSearchAgent:
             except Exception as e:
                 self.logger.warning(f"Resume analysis failed: {e}")
 
+        # Reuse recent results for the same query and resume profile
+        store_key = self._store_key(query)
+        stored_results = self.store.get(store_key)
+        if stored_results is not None:
+            return stored_results
+
         # Enhance query if resume context exists
         enhanced_query = self._generate_advanced_search_query(query)
 
         # Fetch and process job listings
         raw_listings = self._fetch_job_listings(enhanced_query)
-        processed_listings = [
-            JobListing(
-                title=job.get('title', 'Untitled Position'),
-                company=job.get('company', 'Unknown Company'),
-                location=job.get('location', 'Remote/Unspecified'),
-                match_score=50.0,  # Placeholder for match score
-                requirements=job.get('requirements', []),
-                description=job.get('description', 'No description available'),
-                salary_range=job.get('salary', 'Not provided'),
-                application_link=job.get('url', '')
+
+        results = self._rank_listings(query, raw_listings)
+        if raw_listings:
+            self.store.set(store_key, results, expire=SEARCH_RESULTS_TTL)
+        return results
+
+    async def aprocess(self, query: str, resume_path: str = None) -> Dict[str, Any]:
+        """
+        Execute job search asynchronously, fetching the base query while it is enhanced
+        
+        Args:
+            query (str): Job search query
+            resume_path (str, optional): Path to resume PDF
+        
+        Returns:
+            Dict with job search results
+        """
+        if resume_path and os.path.exists(resume_path) and self.resume_analyzer:
+            try:
+                resume_analysis = await self.resume_analyzer.aanalyze_resume(resume_path)
+                self.set_resume_context(resume_analysis)
+            except Exception as e:
+                self.logger.warning(f"Resume analysis failed: {e}")
+
+        store_key = self._store_key(query)
+        stored_results = self.store.get(store_key)
+        if stored_results is not None:
+            return stored_results
+
+        # The LLM only rewrites the query text, so fetch the base query meanwhile
+        base_fetch = asyncio.create_task(self._afetch_job_listings(query))
+        try:
+            enhanced_query = await self._agenerate_advanced_search_query(query)
+        except BaseException:
+            base_fetch.cancel()
+            raise
+
+        if enhanced_query != query:
+            enhanced_listings, base_listings = await asyncio.gather(
+                self._afetch_job_listings(enhanced_query), base_fetch
             )
-            for job in raw_listings
-        ]
+            # Enhanced results first so they win ties on duplicates
+            raw_listings = self._deduplicate_listings(enhanced_listings + base_listings)
+        else:
+            raw_listings = await base_fetch
 
-        # Return top 10 listings
-        return {
-            "status": "success",
-            "results": JobSearchResults(
-                listings=processed_listings[:10],
-                total_results=len(processed_listings),
-                search_parameters={"query": query, "resume_used": bool(self.resume_context)}
-            ).dict()
-        }
+        results = self._rank_listings(query, raw_listings)
+        if raw_listings:
+            self.store.set(store_key, results, expire=SEARCH_RESULTS_TTL)
+        return results
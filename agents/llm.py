@@ -0,0 +1,26 @@
+import asyncio
+from typing import Any, Dict
+
+# Seconds an LLM request may take; set on every Groq client and on async waits for it
+LLM_TIMEOUT = 30
+
+# Recent exchanges replayed to the model on each chat turn
+CHAT_MEMORY_TURNS = 8
+
+
+async def ainvoke_in_thread(runnable: Any, inputs: Dict[str, Any]) -> Any:
+    """
+    Invoke a LangChain runnable from async code through its sync client
+
+    Flask runs every async view in its own event loop, while the Groq clients are shared and
+    their async transport stays bound to the first loop that used it, so the sync call runs
+    in a worker thread. The client's own LLM_TIMEOUT makes that thread return.
+
+    Args:
+        runnable (Any): Chain or chat model to invoke
+        inputs (Dict[str, Any]): Input values for the runnable
+
+    Returns:
+        The runnable's output
+    """
+    return await asyncio.wait_for(asyncio.to_thread(runnable.invoke, inputs), timeout=LLM_TIMEOUT)
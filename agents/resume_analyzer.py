@@ -1,14 +1,105 @@
 import os
-import spacy
+import asyncio
+import hashlib
+import functools
 import PyPDF2
 import logging
-from typing import Dict, Any, List
+import threading
+from typing import Dict, Any, Iterable, List, Optional
 from langchain_groq import ChatGroq  # Changed from OpenAI import
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import PydanticOutputParser
 from pydantic import BaseModel, Field
 from datetime import datetime
 
+from .llm import LLM_TIMEOUT, ainvoke_in_thread
+from .store import ContentStore
+
+try:
+    import pypdfium2
+except ImportError:  # PyPDF2 is used when PDFium bindings are unavailable
+    pypdfium2 = None
+
+# Stored resume analyses are reused for this many seconds
+ANALYSIS_TTL = 7 * 24 * 60 * 60
+
+# Resume text beyond this length adds prompt tokens without improving the analysis
+MAX_RESUME_CHARS = 20000
+
+# Resume insights list at most this many organizations
+MAX_ORGANIZATIONS = 50
+
+COMPANIES_PATH = os.path.join(os.path.dirname(__file__), 'data', 'companies.txt')
+
+# spaCy pipeline components not needed for entity extraction
+UNUSED_SPACY_COMPONENTS = ["parser", "tagger", "lemmatizer", "attribute_ruler"]
+
+def _unique_organizations(names: Iterable[str]) -> List[str]:
+    """
+    Deduplicate organization names case-insensitively
+    
+    Args:
+        names (Iterable[str]): Organization names in order of appearance
+    
+    Returns:
+        List of names in their first-seen casing and order, capped at MAX_ORGANIZATIONS
+    """
+    unique = {}
+    for name in names:
+        name = name.strip()
+        if name:
+            unique.setdefault(name.casefold(), name)
+    return list(unique.values())[:MAX_ORGANIZATIONS]
+
+def _join_pages(page_texts: Iterable[str], max_chars: int) -> str:
+    """
+    Join page texts, stopping once enough characters have been collected
+    
+    Args:
+        page_texts (Iterable[str]): Lazily extracted text of each page
+        max_chars (int): Maximum length of the result
+        
+    Returns:
+        str: Joined text truncated to max_chars
+    """
+    parts = []
+    total_length = 0
+    for page_text in page_texts:
+        parts.append(page_text)
+        total_length += len(page_text) + 1
+        if total_length >= max_chars:
+            break
+    return " ".join(parts)[:max_chars]
+
+@functools.lru_cache(maxsize=1)
+def _load_company_names() -> List[str]:
+    """Read the shipped gazetteer of company names, one per line; names that double as tools or words, such as GitHub or Oracle, are left out for NER to judge in context"""
+    with open(COMPANIES_PATH, encoding='utf-8') as file:
+        return [line.strip() for line in file if line.strip()]
+
+def _names_product(doc, end: int) -> bool:
+    """Whether a company name ending at token index end is part of a product name, such as Google Cloud or Amazon S3"""
+    if end >= len(doc):
+        return False
+    following = doc[end].text[:1]
+    return following.isupper() or following.isdigit()
+
+def resume_digest(resume_path: str) -> str:
+    """
+    Compute a content hash for a resume file
+    
+    Args:
+        resume_path (str): Path to resume PDF
+        
+    Returns:
+        str: Hex SHA-256 digest of the file contents
+    """
+    digest = hashlib.sha256()
+    with open(resume_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
 class JobRecommendation(BaseModel):
     title: str = Field(description="Recommended job title")
     match_score: float = Field(description="Score indicating how well the candidate matches this role (0-100)")
@@ -27,8 +118,37 @@ class EnhancedResumeAnalysis(BaseModel):
     improvement_areas: List[str] = Field(description="General areas for professional development")
     experience_level: List[str] = Field(description="General areas for experience level")
 
+# Output parser and prompt for resume analysis, built once for all agents
+_RESUME_PARSER = PydanticOutputParser(pydantic_object=EnhancedResumeAnalysis)
+
+_RESUME_PROMPT = PromptTemplate(
+    template="""
+    Provide detailed career analysis for the resume below.
+    
+    Focus on:
+    - Detailed skill assessment
+    - Multiple career path recommendations
+    - Specific job titles with match scores (as integers 0-100)
+    - Required vs. missing skills
+    - Concrete improvement steps
+    - Job search strategies
+    
+    {format_instructions}
+    
+    Resume:
+    {resume_text}
+    """,
+    input_variables=["resume_text"],
+    partial_variables={"format_instructions": _RESUME_PARSER.get_format_instructions()}
+)
+
 class ResumeAnalyzerAgent:
-    def __init__(self, llm: ChatGroq = None, api_key: str = None, temperature: float = 0.7):
+    # spaCy pipeline shared by every analyzer in the process
+    _shared_nlp = None
+    _nlp_lock = threading.Lock()
+
+    def __init__(self, llm: ChatGroq = None, api_key: str = None, temperature: float = 0.7,
+                 store: ContentStore = None):
         """
         Initialize Enhanced Resume Analyzer Agent
         
@@ -36,8 +156,9 @@ class ResumeAnalyzerAgent:
             llm (ChatGroq, optional): Language model for analysis
             api_key (str, optional): Groq API key
             temperature (float, optional): Creativity/randomness of model responses
+            store (ContentStore, optional): Persistent store for resume analyses
         """
-        # Use provided LLM or create a new one
+        # Use provided LLM, or validate the API key now and create the client on first use
         if llm is None:
             # Validate API key
             if api_key is None:
@@ -45,45 +166,211 @@ class ResumeAnalyzerAgent:
             
             if not api_key:
                 raise ValueError("Groq API key must be provided either as an argument or via GROQ_API_KEY environment variable")
-            
-            # Default to Llama3-70b as it's typically the most capable Groq model
-            self.llm = ChatGroq(
-                temperature=temperature, 
-                groq_api_key=api_key, 
-                model_name="llama3-70b-8192"
-            )
         else:
             self.llm = llm
+        self._api_key = api_key
+        self._temperature = temperature
         
         self.logger = logging.getLogger(__name__)
         
-        # Load spaCy model for text processing
-        try:
-            self.nlp = spacy.load("en_core_web_sm")
-        except OSError:
-            self.logger.warning("spaCy model not found. Downloading...")
-            spacy.cli.download("en_core_web_sm")
-            self.nlp = spacy.load("en_core_web_sm")
+        # Analysis results keyed by resume content hash, in memory and on disk
+        self._analysis_cache: Dict[str, Dict[str, Any]] = {}
+        self.store = store or ContentStore("resume_analyses")
 
-    def _extract_text_from_pdf(self, pdf_path: str) -> str:
+    @functools.cached_property
+    def llm(self) -> ChatGroq:
+        """Groq client, created on first use when no LLM was injected"""
+        # Default to Llama3-70b as it's typically the most capable Groq model
+        return ChatGroq(
+            temperature=self._temperature, 
+            groq_api_key=self._api_key, 
+            model_name="llama3-70b-8192",
+            request_timeout=LLM_TIMEOUT
+        )
+
+    @classmethod
+    def _load_nlp(cls):
+        """
+        Load the spaCy pipeline once per process and share it between analyzers
+        
+        Returns:
+            spaCy Language with unused components disabled
+        """
+        with cls._nlp_lock:
+            if cls._shared_nlp is None:
+                import spacy
+                
+                try:
+                    cls._shared_nlp = spacy.load("en_core_web_sm", disable=UNUSED_SPACY_COMPONENTS)
+                except OSError:
+                    logging.getLogger(__name__).warning("spaCy model not found. Downloading...")
+                    spacy.cli.download("en_core_web_sm")
+                    cls._shared_nlp = spacy.load("en_core_web_sm", disable=UNUSED_SPACY_COMPONENTS)
+            return cls._shared_nlp
+
+    @functools.cached_property
+    def nlp(self):
+        """spaCy pipeline for text processing, loaded on first use; only named entities are used"""
+        return self._load_nlp()
+
+    @functools.cached_property
+    def org_matcher(self):
+        """Gazetteer matcher for known companies, catching names the NER model misses"""
+        from spacy.matcher import PhraseMatcher
+        
+        # Case-sensitive, so ordinary words spelled like a company name are not matched
+        matcher = PhraseMatcher(self.nlp.vocab, attr="ORTH")
+        matcher.add("ORG", list(self.nlp.tokenizer.pipe(_load_company_names())))
+        return matcher
+
+    def _extract_text_from_pdf(self, pdf_path: str, max_chars: int = MAX_RESUME_CHARS) -> str:
         """
         Extract text from PDF resume
         
         Args:
             pdf_path (str): Path to PDF resume
+            max_chars (int): Stop reading pages once this many characters are collected
             
         Returns:
-            str: Extracted text from PDF
+            str: Extracted text from PDF, at most max_chars long
         """
         try:
-            with open(pdf_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                text = " ".join(page.extract_text() for page in reader.pages)
+            if pypdfium2 is not None:
+                # PDFium is C-backed and much faster than PyPDF2's pure-Python parser
+                pdf = pypdfium2.PdfDocument(pdf_path)
+                try:
+                    text = _join_pages(
+                        (pdf[index].get_textpage().get_text_range() for index in range(len(pdf))), max_chars
+                    )
+                finally:
+                    pdf.close()
+            else:
+                with open(pdf_path, 'rb') as file:
+                    reader = PyPDF2.PdfReader(file)
+                    text = _join_pages((page.extract_text() for page in reader.pages), max_chars)
             return text
         except Exception as e:
             self.logger.error(f"Error extracting PDF text: {e}")
             raise
 
+    def _get_cached_analysis(self, resume_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a previous analysis in memory, then in the persistent store
+        
+        Args:
+            resume_hash (str): Resume content hash
+            
+        Returns:
+            Cached insights, or None on a miss
+        """
+        if resume_hash in self._analysis_cache:
+            return self._analysis_cache[resume_hash]
+        stored_insights = self.store.get(resume_hash)
+        if stored_insights is not None:
+            self._analysis_cache[resume_hash] = stored_insights
+        return stored_insights
+
+    @functools.cached_property
+    def _resume_chain(self):
+        """Prompt, model and parser chain producing EnhancedResumeAnalysis from resume text"""
+        return _RESUME_PROMPT | self.llm | _RESUME_PARSER
+
+    def _fit_nlp_max_length(self, texts: List[str]):
+        """Raise spaCy's length limit so long resumes are not rejected"""
+        longest = max((len(text) for text in texts), default=0)
+        if longest >= self.nlp.max_length:
+            self.nlp.max_length = longest + 100
+
+    def _extract_organizations(self, texts: List[str]) -> List[List[str]]:
+        """
+        Find organization names in resume texts
+        
+        Args:
+            texts (List[str]): Resume texts
+            
+        Returns:
+            Organization names found in each text
+        """
+        self._fit_nlp_max_length(texts)
+        
+        # NER runs on every resume so employers outside the gazetteer are kept; gazetteer
+        # hits that open a product name ("Microsoft Azure") are not employers
+        organizations = []
+        for doc in self.nlp.pipe(texts, batch_size=16):
+            names = [doc[start:end].text for _, start, end in self.org_matcher(doc) if not _names_product(doc, end)]
+            names += [ent.text for ent in doc.ents if ent.label_ == "ORG"]
+            organizations.append(names)
+        return organizations
+
+    def _compile_insights(self, resume_hash: str, analysis: EnhancedResumeAnalysis,
+                          organizations: List[str]) -> Dict[str, Any]:
+        """
+        Combine LLM analysis and extracted organizations into cached resume insights
+        
+        Args:
+            resume_hash (str): Resume content hash
+            analysis (EnhancedResumeAnalysis): Parsed LLM analysis
+            organizations (List[str]): Organization names found in the resume
+            
+        Returns:
+            Dict with comprehensive career insights and recommendations
+        """
+        # Compile comprehensive insights matching template structure
+        resume_insights = {
+            "Career_Recommendations": [
+                {
+                    "Job_Title": job.title,
+                    "Match_Score": job.match_score,  # Integer 0-100
+                    "Required_Skills": job.required_skills,
+                    "Skills_to_Develop": job.missing_skills,
+                    "Action_Plan": job.next_steps,
+                    "Search_Tips": job.job_search_advice
+                }
+                for job in analysis.recommended_jobs
+            ],
+            "Current_Profile": {
+                "Key_Skills": analysis.key_skills,
+                "Experience_Summary": analysis.experience_summary,
+                "Education_Level": analysis.education_level,
+                "Organizations": _unique_organizations(organizations)
+            },
+            "Development_Areas": {
+                "Improvement_Areas": analysis.improvement_areas,
+                "Skill_Gaps": analysis.skill_gaps,
+                "Action_Items": [
+                    step for job in analysis.recommended_jobs 
+                    for step in job.next_steps
+                ]
+            },
+            "Career_Context": {
+                "Objectives": analysis.career_objectives,
+                "Industries": [job.industry for job in analysis.recommended_jobs if hasattr(job, 'industry')],
+                "Experience_Level": analysis.experience_level if hasattr(analysis, 'experience_level') else "Not specified"
+            }
+        }
+        
+        # Add template-specific metadata
+        resume_insights["metadata"] = {
+            "last_updated": datetime.now().isoformat(),
+            "version": "2.0",
+            "analysis_quality": "complete" if all(
+                len(resume_insights[key]) > 0 for key in ["Career_Recommendations", "Current_Profile", "Development_Areas"]
+            ) else "partial"
+        }
+        
+        self._analysis_cache[resume_hash] = resume_insights
+        self.store.set(resume_hash, resume_insights, expire=ANALYSIS_TTL)
+        return resume_insights
+
+    def _analysis_error(self, error: Exception) -> Dict[str, Any]:
+        """Log a failed analysis and build the error response"""
+        self.logger.error(f"Resume analysis error: {error}")
+        return {
+            "error": "Could not fully analyze resume",
+            "details": str(error),
+            "timestamp": datetime.now().isoformat()
+        }
+
     def analyze_resume(self, resume_path: str) -> Dict[str, Any]:
         """
         Enhanced resume analysis with career recommendations aligned with template structure
@@ -94,97 +381,104 @@ class ResumeAnalyzerAgent:
         Returns:
             Dict with comprehensive career insights and recommendations
         """
+        # Return the cached analysis if this exact resume was seen before
+        resume_hash = resume_digest(resume_path)
+        cached_insights = self._get_cached_analysis(resume_hash)
+        if cached_insights is not None:
+            return cached_insights
+        
         # Extract text from PDF
         resume_text = self._extract_text_from_pdf(resume_path)
         
-        # Create output parser
-        parser = PydanticOutputParser(pydantic_object=EnhancedResumeAnalysis)
-        
-        # Create detailed prompt template
-        prompt = PromptTemplate(
-            template="""
-            Provide detailed career analysis for the following resume:
-            {resume_text}
-            
-            Focus on:
-            - Detailed skill assessment
-            - Multiple career path recommendations
-            - Specific job titles with match scores (as integers 0-100)
-            - Required vs. missing skills
-            - Concrete improvement steps
-            - Job search strategies
-            
-            {format_instructions}
-            """,
-            input_variables=["resume_text"],
-            partial_variables={"format_instructions": parser.get_format_instructions()}
-        )
-        
-        # Generate chain
-        chain = prompt | self.llm | parser
-        
         try:
             # Analyze resume
-            analysis = chain.invoke({"resume_text": resume_text})
+            analysis = self._resume_chain.invoke({"resume_text": resume_text})
             
             # Process with spaCy for additional insights
-            doc = self.nlp(resume_text)
+            organizations = self._extract_organizations([resume_text])[0]
             
-            # Extract relevant entities
-            organizations = [ent.text for ent in doc.ents if ent.label_ == "ORG"]
-            
-            # Compile comprehensive insights matching template structure
-            resume_insights = {
-                "Career_Recommendations": [
-                    {
-                        "Job_Title": job.title,
-                        "Match_Score": job.match_score,  # Integer 0-100
-                        "Required_Skills": job.required_skills,
-                        "Skills_to_Develop": job.missing_skills,
-                        "Action_Plan": job.next_steps,
-                        "Search_Tips": job.job_search_advice
-                    }
-                    for job in analysis.recommended_jobs
-                ],
-                "Current_Profile": {
-                    "Key_Skills": analysis.key_skills,
-                    "Experience_Summary": analysis.experience_summary,
-                    "Education_Level": analysis.education_level,
-                    "Organizations": list(set(organizations))
-                },
-                "Development_Areas": {
-                    "Improvement_Areas": analysis.improvement_areas,
-                    "Skill_Gaps": analysis.skill_gaps,
-                    "Action_Items": [
-                        step for job in analysis.recommended_jobs 
-                        for step in job.next_steps
-                    ]
-                },
-                "Career_Context": {
-                    "Objectives": analysis.career_objectives,
-                    "Industries": [job.industry for job in analysis.recommended_jobs if hasattr(job, 'industry')],
-                    "Experience_Level": analysis.experience_level if hasattr(analysis, 'experience_level') else "Not specified"
-                }
-            }
+            return self._compile_insights(resume_hash, analysis, organizations)
+                
+        except Exception as e:
+            return self._analysis_error(e)
+
+    async def aanalyze_resume(self, resume_path: str) -> Dict[str, Any]:
+        """
+        Analyze a resume without blocking the event loop
+        
+        Args:
+            resume_path (str): Path to resume PDF
+                
+        Returns:
+            Dict with comprehensive career insights and recommendations
+        """
+        resume_hash = await asyncio.to_thread(resume_digest, resume_path)
+        cached_insights = self._get_cached_analysis(resume_hash)
+        if cached_insights is not None:
+            return cached_insights
+        
+        resume_text = await asyncio.to_thread(self._extract_text_from_pdf, resume_path)
+        
+        try:
+            # Abandoned if the LLM has not answered within LLM_TIMEOUT seconds
+            analysis = await ainvoke_in_thread(self._resume_chain, {"resume_text": resume_text})
             
-            # Add template-specific metadata
-            resume_insights["metadata"] = {
-                "last_updated": datetime.now().isoformat(),
-                "version": "2.0",
-                "analysis_quality": "complete" if all(
-                    len(resume_insights[key]) > 0 for key in ["Career_Recommendations", "Current_Profile", "Development_Areas"]
-                ) else "partial"
-            }
+            # spaCy is CPU-bound, so keep it off the event loop
+            organizations = (await asyncio.to_thread(self._extract_organizations, [resume_text]))[0]
             
-            return resume_insights
+            return self._compile_insights(resume_hash, analysis, organizations)
                 
         except Exception as e:
-            self.logger.error(f"Resume analysis error: {e}")
-            return {
-                "error": "Could not fully analyze resume",
-                "details": str(e),
-                "timestamp": datetime.now().isoformat()
-            }
+            return self._analysis_error(e)
+
+    def analyze_resumes(self, resume_paths: List[str], batch_size: int = 8) -> List[Dict[str, Any]]:
+        """
+        Analyze several resumes, batching the LLM calls and the spaCy pass
+        
+        Args:
+            resume_paths (List[str]): Paths to resume PDFs
+            batch_size (int): Maximum number of concurrent LLM requests
+                
+        Returns:
+            List of insights dicts in the same order as resume_paths
+        """
+        resume_hashes = [resume_digest(path) for path in resume_paths]
+        
+        # Resolve cache hits, leaving each distinct uncached resume once
+        results: Dict[str, Dict[str, Any]] = {}
+        pending: Dict[str, str] = {}
+        for path, resume_hash in zip(resume_paths, resume_hashes):
+            cached_insights = self._get_cached_analysis(resume_hash)
+            if cached_insights is not None:
+                results[resume_hash] = cached_insights
+            elif resume_hash not in pending:
+                pending[resume_hash] = path
+        
+        if pending:
+            texts = {resume_hash: self._extract_text_from_pdf(path) for resume_hash, path in pending.items()}
+            
+            # Send every uncached resume to the LLM as one concurrent batch
+            outputs = self._resume_chain.batch(
+                [{"resume_text": resume_text} for resume_text in texts.values()],
+                config={"max_concurrency": batch_size},
+                return_exceptions=True
+            )
+            analyses = {}
+            for resume_hash, output in zip(texts, outputs):
+                if isinstance(output, Exception):
+                    results[resume_hash] = self._analysis_error(output)
+                else:
+                    analyses[resume_hash] = output
+            
+            # One spaCy pass over every successfully analyzed resume
+            organizations = self._extract_organizations([texts[resume_hash] for resume_hash in analyses])
+            for (resume_hash, analysis), names in zip(analyses.items(), organizations):
+                try:
+                    results[resume_hash] = self._compile_insights(resume_hash, analysis, names)
+                except Exception as e:
+                    results[resume_hash] = self._analysis_error(e)
+        
+        return [results[resume_hash] for resume_hash in resume_hashes]
 
 
     def process(self, query: str, resume_path: str = None) -> Dict[str, Any]:
@@ -0,0 +1,149 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+from contextlib import closing
+from typing import Any, Optional
+
+import numpy as np
+
+from ._scoring import cosine_topk, warm_up
+from .embeddings import embed_text
+from .store import DEFAULT_CACHE_DIR
+
+try:
+    import sqlite_vec
+except ImportError:  # Similarity search falls back to numpy without sqlite-vec
+    sqlite_vec = None
+
+# Cached responses are reused for near-duplicate queries with at least this cosine similarity
+SIMILARITY_THRESHOLD = 0.92
+
+# Cached responses expire after this many seconds
+SEMANTIC_CACHE_TTL = 6 * 60 * 60
+
+
+class SemanticCache:
+    def __init__(self, path: str = None, threshold: float = SIMILARITY_THRESHOLD, ttl: float = SEMANTIC_CACHE_TTL):
+        """
+        Initialize a cache of responses looked up by query embedding similarity
+
+        Args:
+            path (str, optional): SQLite database path. Defaults to cache.db in DEFAULT_CACHE_DIR
+            threshold (float): Minimum cosine similarity for a cache hit
+            ttl (float): Lifetime of cached responses in seconds
+        """
+        self.path = path or os.path.join(DEFAULT_CACHE_DIR, 'cache.db')
+        self.threshold = threshold
+        self.ttl = ttl
+        self.logger = logging.getLogger(__name__)
+        self._initialized = False
+        self._use_sqlite_vec = sqlite_vec is not None
+
+        # Compile the fallback similarity kernel now rather than on the first lookup
+        warm_up()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection, creating the table and loading sqlite-vec on first use"""
+        if not self._initialized:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=5)
+        if self._use_sqlite_vec:
+            try:
+                connection.enable_load_extension(True)
+                sqlite_vec.load(connection)
+                connection.enable_load_extension(False)
+            except (AttributeError, sqlite3.Error) as e:
+                # Some Python builds cannot load SQLite extensions
+                self.logger.warning(f"sqlite-vec unavailable, using numpy search: {e}")
+                self._use_sqlite_vec = False
+        if not self._initialized:
+            with connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS semantic_cache ("
+                    "namespace TEXT NOT NULL, embedding BLOB NOT NULL, response TEXT NOT NULL, "
+                    "created_at REAL NOT NULL)"
+                )
+                connection.execute(
+                    "CREATE INDEX IF NOT EXISTS semantic_cache_namespace ON semantic_cache (namespace, created_at)"
+                )
+            self._initialized = True
+        return connection
+
+    @staticmethod
+    def _embed(query: str) -> Optional[np.ndarray]:
+        """Embed a normalized query, or None when embeddings are unavailable"""
+        return embed_text(" ".join(query.lower().split()))
+
+    def get(self, query: str, namespace: str = "") -> Optional[Any]:
+        """
+        Look up the response to a similar earlier query
+
+        Args:
+            query (str): User query
+            namespace (str): Scope of the lookup, such as the resume hash
+
+        Returns:
+            The cached response, or None on a miss
+        """
+        embedding = self._embed(query)
+        if embedding is None:
+            return None
+
+        cutoff = time.time() - self.ttl
+        try:
+            with closing(self._connect()) as connection:
+                if self._use_sqlite_vec:
+                    row = connection.execute(
+                        "SELECT response FROM semantic_cache "
+                        "WHERE namespace = ? AND created_at > ? AND vec_distance_cosine(embedding, ?) < ? "
+                        "ORDER BY vec_distance_cosine(embedding, ?) LIMIT 1",
+                        (namespace, cutoff, embedding.tobytes(), 1 - self.threshold, embedding.tobytes())
+                    ).fetchone()
+                    return json.loads(row[0]) if row else None
+
+                rows = connection.execute(
+                    "SELECT embedding, response FROM semantic_cache WHERE namespace = ? AND created_at > ?",
+                    (namespace, cutoff)
+                ).fetchall()
+        except sqlite3.Error as e:
+            self.logger.warning(f"Semantic cache read failed: {e}")
+            return None
+
+        if not rows:
+            return None
+        # One contiguous float32 matrix of embeddings, separate from the responses
+        matrix = np.frombuffer(b"".join(stored for stored, _ in rows), dtype=np.float32).reshape(len(rows), -1)
+        best, similarity = cosine_topk(embedding, matrix, 1)
+        return json.loads(rows[best[0]][1]) if similarity[0] >= self.threshold else None
+
+    def set(self, query: str, response: Any, namespace: str = ""):
+        """
+        Cache the response to a query
+
+        Args:
+            query (str): User query
+            response (Any): JSON-serializable response
+            namespace (str): Scope of the entry, such as the resume hash
+        """
+        embedding = self._embed(query)
+        if embedding is None:
+            return
+
+        try:
+            serialized = json.dumps(response)
+        except (TypeError, ValueError) as e:
+            self.logger.warning(f"Response not cacheable: {e}")
+            return
+
+        now = time.time()
+        try:
+            with closing(self._connect()) as connection, connection:
+                connection.execute("DELETE FROM semantic_cache WHERE created_at <= ?", (now - self.ttl,))
+                connection.execute(
+                    "INSERT INTO semantic_cache (namespace, embedding, response, created_at) VALUES (?, ?, ?, ?)",
+                    (namespace, embedding.tobytes(), serialized, now)
+                )
+        except sqlite3.Error as e:
+            self.logger.warning(f"Semantic cache write failed: {e}")
@@ -0,0 +1,151 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+from contextlib import closing
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:  # Falls back to the standard json module
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # Values are stored uncompressed without zstandard
+    zstandard = None
+
+DEFAULT_CACHE_DIR = os.getenv('CAREERSTACK_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.careerstack'))
+
+# Stored values are bytes prefixed with a one-byte format marker
+_FORMAT_JSON = b'j'
+_FORMAT_ZSTD = b'z'
+ZSTD_LEVEL = 3
+
+# Raised for corrupt or truncated entries; orjson's JSONDecodeError is a ValueError
+_DECODE_ERRORS = (ValueError,) + ((zstandard.ZstdError,) if zstandard is not None else ())
+
+
+def _dumps(value: Any) -> bytes:
+    """Serialize a value to JSON bytes, compressed when zstandard is available"""
+    if orjson is not None:
+        data = orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    else:
+        data = json.dumps(value).encode('utf-8')
+    if zstandard is not None:
+        return _FORMAT_ZSTD + zstandard.compress(data, ZSTD_LEVEL)
+    return _FORMAT_JSON + data
+
+
+def _loads(raw: bytes) -> Any:
+    """Deserialize a stored value written by _dumps"""
+    marker, data = raw[:1], raw[1:]
+    if marker == _FORMAT_ZSTD:
+        if zstandard is None:
+            raise ValueError("zstandard is required to read this entry")
+        data = zstandard.decompress(data)
+    elif marker != _FORMAT_JSON:
+        raise ValueError(f"Unknown entry format {marker!r}")
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def content_key(*parts: str) -> str:
+    """
+    Build a content-addressed key from one or more strings
+
+    Args:
+        *parts (str): Values identifying the cached content
+
+    Returns:
+        str: Hex SHA-256 digest of the parts
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class ContentStore:
+    def __init__(self, namespace: str, path: str = None):
+        """
+        Initialize a persistent key-value store backed by SQLite
+
+        Args:
+            namespace (str): Name separating this store's keys from others in the same file
+            path (str, optional): SQLite database path. Defaults to cache.db in DEFAULT_CACHE_DIR
+        """
+        self.namespace = namespace
+        self.path = path or os.path.join(DEFAULT_CACHE_DIR, 'cache.db')
+        self.logger = logging.getLogger(__name__)
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection, creating the database on first use"""
+        if not self._initialized:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=5)
+        if not self._initialized:
+            with connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS entries ("
+                    "namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, "
+                    "created_at REAL NOT NULL, expires_at REAL, PRIMARY KEY (namespace, key))"
+                )
+            self._initialized = True
+        return connection
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Look up a stored value
+
+        Args:
+            key (str): Entry key
+            default (Any): Value returned on a miss
+
+        Returns:
+            The stored value, or default if missing, expired or unreadable
+        """
+        try:
+            with closing(self._connect()) as connection:
+                row = connection.execute(
+                    "SELECT value, expires_at FROM entries WHERE namespace = ? AND key = ?",
+                    (self.namespace, key)
+                ).fetchone()
+        except sqlite3.Error as e:
+            self.logger.warning(f"Content store read failed: {e}")
+            return default
+
+        if row is None:
+            return default
+        value, expires_at = row
+        if expires_at is not None and expires_at < time.time():
+            return default
+        try:
+            return _loads(value)
+        except _DECODE_ERRORS as e:
+            self.logger.warning(f"Content store entry unreadable: {e}")
+            return default
+
+    def set(self, key: str, value: Any, expire: Optional[float] = None):
+        """
+        Store a JSON-serializable value, compressed when zstandard is available
+
+        Args:
+            key (str): Entry key
+            value (Any): Value to store
+            expire (float, optional): Lifetime in seconds. Entries never expire by default
+        """
+        now = time.time()
+        try:
+            with closing(self._connect()) as connection, connection:
+                connection.execute("DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at < ?", (now,))
+                connection.execute(
+                    "INSERT OR REPLACE INTO entries (namespace, key, value, created_at, expires_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (self.namespace, key, _dumps(value), now, now + expire if expire else None)
+                )
+        except sqlite3.Error as e:
+            self.logger.warning(f"Content store write failed: {e}")
@@ -1,15 +1,34 @@
 import os
+import asyncio
 import logging
-from typing import Dict, Any, List
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 
 from langchain_groq import ChatGroq
 from langchain_core.messages import HumanMessage, AIMessage, BaseMessage
 
 # Import individual agents
 from .job_search import JobSearchAgent
-from .resume_analyzer import ResumeAnalyzerAgent
+from .resume_analyzer import ResumeAnalyzerAgent, resume_digest
 from .cover_letter_generator import CoverLetterAgent
-from .web_researcher import ScrapyWebResearchAgent
+from .semantic_cache import SemanticCache
+from .intents import matched_intents
+from .llm import CHAT_MEMORY_TURNS, LLM_TIMEOUT
+
+# Registered agent serving each intent; research starts its own crawler per query
+INTENT_AGENTS = {
+    "job_search": "job_search",
+    "cover_letter": "cover_letter",
+    "resume": "resume_analyzer",
+}
+
+# Intents whose responses are never served from the semantic cache; a cover letter
+# is written for one request, so a near-duplicate request should get a fresh one
+UNCACHED_INTENTS = {"cover_letter"}
+
+# Chat sessions whose conversation history is kept, least recently used evicted first
+MAX_CHAT_SESSIONS = 256
 
 
 class JobAssistantSupervisor:
@@ -23,7 +42,10 @@ class JobAssistantSupervisor:
         """
         self.resume_path = None
         self.resume_insights = None
-        self.conversation_history: List[BaseMessage] = []
+        self.resume_hash = ""
+        # Streamed conversation history per chat session
+        self._chat_histories: "OrderedDict[str, List[BaseMessage]]" = OrderedDict()
+        self._chat_histories_lock = threading.Lock()
 
         # Set up API key and language model
         api_key = api_key or os.getenv("GROQ_API_KEY")
@@ -33,11 +55,15 @@ class JobAssistantSupervisor:
             temperature=temperature,
             groq_api_key=api_key,
             model_name="llama3-70b-8192",
+            request_timeout=LLM_TIMEOUT,
         )
 
         self.agents = self._register_agents()
         self.logger = self._setup_logger()
 
+        # Responses to near-duplicate queries, scoped per resume and intent
+        self.semantic_cache = SemanticCache()
+
     @staticmethod
     def _setup_logger() -> logging.Logger:
         """Set up logging."""
@@ -56,7 +82,6 @@ class JobAssistantSupervisor:
             "job_search": JobSearchAgent(self.llm),
             "resume_analyzer": ResumeAnalyzerAgent(self.llm),
             "cover_letter": CoverLetterAgent(self.llm),
-            "web_researcher": ScrapyWebResearchAgent,  # Store the class for instantiation
         }
 
     def set_resume(self, resume_path: str) -> Dict[str, Any]:
@@ -72,8 +97,17 @@ class JobAssistantSupervisor:
         if not os.path.exists(resume_path):
             raise FileNotFoundError(f"Resume not found at {resume_path}")
 
+        resume_hash = resume_digest(resume_path)
         self.resume_path = resume_path
+        if resume_hash == self.resume_hash and self.resume_insights is not None:
+            # Same resume content: agents already hold its context
+            self.logger.info("Resume unchanged; reusing existing analysis.")
+            return self.resume_insights
+
+        # Analyses are cached by content hash in memory and on disk by the analyzer
         self.resume_insights = self.agents["resume_analyzer"].analyze_resume(resume_path)
+        # Only a successful analysis is reused; a failed one is retried when the resume is set again
+        self.resume_hash = "" if "error" in self.resume_insights else resume_hash
 
         # Share resume context with other agents
         for agent_name in ["job_search", "cover_letter"]:
@@ -95,17 +129,25 @@ class JobAssistantSupervisor:
             Dict with agent's response and metadata.
         """
         intent = self._classify_intent(query)
+        if intent == "unknown":
+            return {"intent": "unknown", "response": "Please clarify your query.", "agent": None}
 
+        cache_namespace = f"{self.resume_hash}:{intent}"
         try:
-            if intent == "research":
-                research_results = self._handle_web_research(query)
-                return {"intent": intent, "response": research_results, "agent": "ScrapyWebResearchAgent"}
-
-            if intent == "unknown":
-                return {"intent": "unknown", "response": "Please clarify your query.", "agent": None}
+            cached_result = None if intent in UNCACHED_INTENTS else self._cached_result(query, cache_namespace)
+            if cached_result is not None:
+                return cached_result
 
-            response = self._process_with_agent(intent, query)
-            return {"intent": intent, "response": response, "agent": intent.capitalize() + "Agent"}
+            if intent == "research":
+                response = self._handle_web_research(query)
+                result = {"intent": intent, "response": response, "agent": "WebResearchAgent"}
+            else:
+                response = self._process_with_agent(intent, query)
+                result = {"intent": intent, "response": self._format_response(intent, response),
+                          "agent": intent.capitalize() + "Agent"}
+            if self._is_cacheable(intent, response):
+                self._cache_result(query, result, cache_namespace)
+            return result
 
         except KeyError:
             self.logger.error(f"Agent for intent '{intent}' not available.")
@@ -115,7 +157,199 @@ class JobAssistantSupervisor:
             self.logger.error(f"Error processing query: {e}")
             return {"intent": intent, "response": "An error occurred.", "error": str(e), "agent": None}
 
-    def _process_with_agent(self, intent: str, query: str) -> str:
+    def stream_query(self, query: str, session_id: str = "") -> Iterator[Dict[str, Any]]:
+        """
+        Process user query, yielding the response incrementally.
+
+        Resume questions, which the resume analyzer answers straight from the language model,
+        are streamed token by token with the session's earlier turns as context; other queries
+        run through aprocess_query, every matched agent concurrently, and arrive as one chunk.
+        Every turn is recorded in the session's history.
+
+        Args:
+            query (str): User's input query.
+            session_id (str): Chat session the query belongs to; each session has its own history.
+
+        Yields:
+            Dict events with a "token" chunk, then a final "done" event with metadata.
+        """
+        intents = self._classify_intents(query)
+        if intents != ["resume"]:
+            # Called from a streaming response's worker thread, where no event loop is running
+            result = asyncio.run(self.aprocess_query(query))
+            response = str(result.get("response"))
+            self._record_turn(session_id, query, response)
+            yield {"token": response}
+            yield {"done": True, "intent": result.get("intent"), "agent": result.get("agent"),
+                   "error": result.get("error")}
+            return
+
+        intent = intents[0]
+        history = self._session_history(session_id)
+        chunks = []
+        for chunk in self.llm.stream([*history, HumanMessage(content=query)]):
+            if chunk.content:
+                chunks.append(chunk.content)
+                yield {"token": chunk.content}
+        self._record_turn(session_id, query, "".join(chunks))
+        yield {"done": True, "intent": intent, "agent": intent.capitalize() + "Agent", "error": None}
+
+    def _session_history(self, session_id: str) -> List[BaseMessage]:
+        """
+        Get a copy of a chat session's conversation history.
+
+        Args:
+            session_id (str): Chat session identifier.
+
+        Returns:
+            List[BaseMessage]: The session's messages, oldest first; empty for a new session.
+        """
+        with self._chat_histories_lock:
+            return list(self._chat_histories.get(session_id, ()))
+
+    def _record_turn(self, session_id: str, query: str, answer: str):
+        """
+        Append a question and its answer to a chat session's history, keeping the last CHAT_MEMORY_TURNS exchanges.
+
+        Args:
+            session_id (str): Chat session identifier.
+            query (str): User's input query.
+            answer (str): Language model answer.
+        """
+        with self._chat_histories_lock:
+            history = self._chat_histories.setdefault(session_id, [])
+            history.extend([HumanMessage(content=query), AIMessage(content=answer)])
+            del history[:-2 * CHAT_MEMORY_TURNS]
+            self._chat_histories.move_to_end(session_id)
+            while len(self._chat_histories) > MAX_CHAT_SESSIONS:
+                self._chat_histories.popitem(last=False)
+
+    async def aprocess_query(self, query: str) -> Dict[str, Any]:
+        """
+        Process user query without blocking the event loop, running every matched agent concurrently.
+
+        Args:
+            query (str): User's input query.
+
+        Returns:
+            Dict with the agents' combined response and metadata.
+        """
+        intents = self._classify_intents(query)
+        if not intents:
+            return {"intent": "unknown", "response": "Please clarify your query.", "agent": None}
+
+        # Embedding the query is CPU-bound, so keep cache lookups off the event loop
+        cache_namespace = f"{self.resume_hash}:{'+'.join(intents)}"
+        cacheable = not UNCACHED_INTENTS.intersection(intents)
+        if cacheable:
+            cached_result = await asyncio.to_thread(self._cached_result, query, cache_namespace)
+            if cached_result is not None:
+                return cached_result
+
+        outcomes = await asyncio.gather(*(self._arun_intent(intent, query) for intent in intents))
+        results = [result for result, _ in outcomes]
+        cacheable = cacheable and all(result_cacheable for _, result_cacheable in outcomes)
+        if len(results) == 1:
+            result = results[0]
+        else:
+            errors = [r["error"] for r in results if r.get("error")]
+            result = {
+                "intent": ", ".join(r["intent"] for r in results),
+                # Empty results, such as a crawl that found nothing, add nothing to the reply
+                "response": "\n\n".join(str(r["response"]) for r in results if r["response"]),
+                "agent": ", ".join(r["agent"] for r in results if r["agent"]) or None
+            }
+            if errors:
+                result["error"] = "; ".join(errors)
+
+        if cacheable:
+            await asyncio.to_thread(self._cache_result, query, result, cache_namespace)
+        return result
+
+    async def _arun_intent(self, intent: str, query: str) -> Tuple[Dict[str, Any], bool]:
+        """
+        Run the agent for one intent.
+
+        Args:
+            intent (str): Classified intent.
+            query (str): User's input query.
+
+        Returns:
+            Tuple of a dict with the agent's response and metadata, and whether the response may be cached.
+        """
+        try:
+            if intent == "research":
+                response = await self._ahandle_web_research(query)
+                result = {"intent": intent, "response": response, "agent": "WebResearchAgent"}
+            else:
+                response = await self._aprocess_with_agent(intent, query)
+                result = {"intent": intent, "response": self._format_response(intent, response),
+                          "agent": intent.capitalize() + "Agent"}
+            return result, self._is_cacheable(intent, response)
+
+        except KeyError:
+            self.logger.error(f"Agent for intent '{intent}' not available.")
+            return {"intent": intent, "response": "Agent not available.", "error": "Agent missing.", "agent": None}, False
+
+        except Exception as e:
+            self.logger.error(f"Error processing query: {e}")
+            return {"intent": intent, "response": "An error occurred.", "error": str(e), "agent": None}, False
+
+    def _cached_result(self, query: str, cache_namespace: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up the result of a near-duplicate earlier query.
+
+        Args:
+            query (str): User's input query.
+            cache_namespace (str): Resume hash and intents the result is scoped to.
+
+        Returns:
+            The cached result, or None on a miss or when the cache cannot be read.
+        """
+        try:
+            return self.semantic_cache.get(query, cache_namespace)
+        except Exception as e:
+            # A failing encoder or cache only costs the lookup
+            self.logger.warning(f"Semantic cache lookup failed: {e}")
+            return None
+
+    def _cache_result(self, query: str, result: Dict[str, Any], cache_namespace: str):
+        """
+        Cache a result for near-duplicate queries, ignoring cache failures.
+
+        Args:
+            query (str): User's input query.
+            result (Dict[str, Any]): Result to cache.
+            cache_namespace (str): Resume hash and intents the result is scoped to.
+        """
+        try:
+            self.semantic_cache.set(query, result, cache_namespace)
+        except Exception as e:
+            self.logger.warning(f"Semantic cache write failed: {e}")
+
+    @staticmethod
+    def _is_cacheable(intent: str, response: Any) -> bool:
+        """
+        Check whether an agent response is worth serving again.
+
+        Args:
+            intent (str): Query intent.
+            response (Any): Raw agent response, or research results.
+
+        Returns:
+            bool: False for uncached intents, errors and empty results.
+        """
+        if intent in UNCACHED_INTENTS or not response:
+            return False
+        if not isinstance(response, dict):
+            return True
+        if response.get("status") == "error" or "error" in response:
+            return False
+        if intent == "job_search":
+            return bool(response.get("results", {}).get("listings"))
+        return True
+
+    def _process_with_agent(self, intent: str, query: str) -> Dict[str, Any]:
         """
         Process the query using the appropriate agent.
 
@@ -124,12 +358,29 @@ class JobAssistantSupervisor:
             query (str): User's input query.
 
         Returns:
-            str: Formatted response.
+            Dict[str, Any]: Raw agent response.
         """
-        agent = self.agents[intent]
+        agent = self.agents[INTENT_AGENTS[intent]]
         resume_path = self.resume_path if intent in ["job_search", "cover_letter"] else None
-        response = agent.process(query, resume_path=resume_path)
-        return self._format_response(intent, response)
+        return agent.process(query, resume_path=resume_path)
+
+    async def _aprocess_with_agent(self, intent: str, query: str) -> Dict[str, Any]:
+        """
+        Process the query using the appropriate agent's async path when it has one.
+
+        Args:
+            intent (str): Classified intent.
+            query (str): User's input query.
+
+        Returns:
+            Dict[str, Any]: Raw agent response.
+        """
+        agent = self.agents[INTENT_AGENTS[intent]]
+        resume_path = self.resume_path if intent in ["job_search", "cover_letter"] else None
+        if hasattr(agent, "aprocess"):
+            return await agent.aprocess(query, resume_path=resume_path)
+        # Agents without an async path run in a worker thread
+        return await asyncio.to_thread(agent.process, query, resume_path=resume_path)
 
     def _handle_web_research(self, query: str) -> Any:
         """
@@ -141,9 +392,27 @@ class JobAssistantSupervisor:
         Returns:
             Any: Research results.
         """
-        web_researcher = self.agents["web_researcher"](query)
+        # Imported here so the HTML parser is only loaded when research is requested
+        from .web_researcher import WebResearchAgent
+
+        web_researcher = WebResearchAgent(query)
         return web_researcher.run_research()
 
+    async def _ahandle_web_research(self, query: str) -> Any:
+        """
+        Handle queries related to web research without blocking the event loop.
+
+        Args:
+            query (str): User's input query.
+
+        Returns:
+            Any: Research results.
+        """
+        from .web_researcher import WebResearchAgent
+
+        web_researcher = WebResearchAgent(query)
+        return await web_researcher.arun_research()
+
     def _classify_intent(self, query: str) -> str:
         """
         Classify user query intent.
@@ -154,17 +423,24 @@ class JobAssistantSupervisor:
         Returns:
             str: Classified intent.
         """
-        query = query.lower()
-        intents_mapping = {
-            "job_search": ["job", "position", "career", "opportunity", "roles"],
-            "cover_letter": ["cover letter", "application", "recommendation", "letter"],
-            "resume": ["resume", "cv", "skill", "experience", "profile"],
-            "research": ["research", "information", "learn", "find out", "details"],
-        }
-        for intent, keywords in intents_mapping.items():
-            if any(keyword in query for keyword in keywords):
-                return intent
-        return "unknown"
+        intents = self._classify_intents(query)
+        return intents[0] if intents else "unknown"
+
+    def _classify_intents(self, query: str) -> List[str]:
+        """
+        Find every intent the query mentions.
+
+        Args:
+            query (str): User input query.
+
+        Returns:
+            List[str]: Matched intents in priority order, empty if none matched.
+        """
+        # Only intents something can serve are dispatched
+        return [
+            intent for intent in matched_intents(query)
+            if intent == "research" or INTENT_AGENTS.get(intent) in self.agents
+        ]
 
     def _format_response(self, intent: str, response: Dict[str, Any]) -> str:
         """
@@ -1,4 +1,5 @@
 from flask import Flask
+from flask_session import Session
 from config import Config
 
 def create_app(config_class=Config):
@@ -6,6 +7,13 @@ def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
     
+    # Keep session data on the server; resume insights outgrow a cookie
+    Session(app)
+    
+    # One supervisor per app, shared by every blueprint and request
+    from agents.supervisor import JobAssistantSupervisor
+    app.extensions["job_assistant"] = JobAssistantSupervisor()
+    
     from .routes import main_bp
     app.register_blueprint(main_bp)
     
@@ -1,12 +1,16 @@
 import os
-from flask import Blueprint, render_template, request, jsonify, redirect, url_for, session, flash, current_app
+from flask import Blueprint, render_template, request, jsonify, redirect, url_for, session, flash, current_app, Response, stream_with_context
 from werkzeug.utils import secure_filename
 from config import Config
 from .forms import ResumeUploadForm, ChatForm
-from agents.supervisor import JobAssistantSupervisor
 from app.services.chat_agent import ChatAgent
 import logging
 import json
+import orjson
+import uuid
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import time
 
@@ -17,21 +21,76 @@ logger = logging.getLogger(__name__)
 
 main_bp = Blueprint('main', __name__)
 
-# Initialize job assistant
-job_assistant = JobAssistantSupervisor()
+# Session keys; resume path and insights are only touched by store_resume_data and get_resume_data
+SESSION_RESUME_KEY = "resume_path"
+SESSION_INSIGHTS_KEY = "resume_insights"
+SESSION_TASK_KEY = "analysis_task_id"
+SESSION_INSIGHTS_ID_KEY = "resume_insights_id"
+SESSION_CHAT_KEY = "chat_id"
+
+# Parsed insights kept in memory so requests skip deserializing the session copy
+MAX_CACHED_INSIGHTS = 256
+_insights_cache = OrderedDict()
+_insights_cache_lock = threading.Lock()
+
+# Background analyses still running after this many seconds are reported as timed out
+ANALYSIS_TIMEOUT = 60
+
+# Most recent background analyses, task_id -> (resume path, start time, future)
+MAX_ANALYSIS_TASKS = 256
+
+# One worker: the supervisor holds a single resume context at a time
+_analysis_executor = ThreadPoolExecutor(max_workers=1)
+_analysis_tasks = OrderedDict()
+_analysis_tasks_lock = threading.Lock()
+
+def get_job_assistant():
+    """Return the application's JobAssistantSupervisor, created in create_app"""
+    return current_app.extensions["job_assistant"]
+
+def start_resume_analysis(filepath):
+    """Analyze a resume in the background and return the task id to poll"""
+    task_id = uuid.uuid4().hex
+    future = _analysis_executor.submit(get_job_assistant().set_resume, filepath)
+    with _analysis_tasks_lock:
+        _analysis_tasks[task_id] = (filepath, time.time(), future)
+        while len(_analysis_tasks) > MAX_ANALYSIS_TASKS:
+            _analysis_tasks.popitem(last=False)
+    return task_id
+
+def _cache_insights(insights_id, resume_insights):
+    """Remember parsed insights, evicting the least recently used beyond MAX_CACHED_INSIGHTS"""
+    with _insights_cache_lock:
+        _insights_cache[insights_id] = resume_insights
+        _insights_cache.move_to_end(insights_id)
+        while len(_insights_cache) > MAX_CACHED_INSIGHTS:
+            _insights_cache.popitem(last=False)
 
 def store_resume_data(filepath, resume_insights):
     """Store both resume path and insights in session"""
-    session['uploaded_resume_path'] = filepath
-    # Store insights as JSON string to ensure it's serializable
-    session['resume_insights'] = json.dumps(resume_insights)
+    insights_id = uuid.uuid4().hex
+    _cache_insights(insights_id, resume_insights)
+    session[SESSION_RESUME_KEY] = filepath
+    session[SESSION_INSIGHTS_ID_KEY] = insights_id
+    # JSON copy for other worker processes and for entries evicted from the cache
+    session[SESSION_INSIGHTS_KEY] = orjson.dumps(resume_insights, option=orjson.OPT_NON_STR_KEYS)
     logger.info(f"Stored resume data in session: {filepath}")
 
 def get_resume_data():
     """Retrieve resume path and insights from session"""
-    filepath = session.get('resume_path')
-    insights_json = session.get('resume_insights')
-    insights = json.loads(insights_json) if insights_json else None
+    filepath = session.get(SESSION_RESUME_KEY)
+    insights_id = session.get(SESSION_INSIGHTS_ID_KEY)
+    with _insights_cache_lock:
+        insights = _insights_cache.get(insights_id)
+        if insights is not None:
+            _insights_cache.move_to_end(insights_id)
+    if insights is not None:
+        return filepath, insights
+
+    insights_json = session.get(SESSION_INSIGHTS_KEY)
+    insights = orjson.loads(insights_json) if insights_json else None
+    if insights is not None and insights_id:
+        _cache_insights(insights_id, insights)
     return filepath, insights
 
 
@@ -52,11 +111,11 @@ def upload_resume():
         return jsonify({'success': False, 'error': 'No resume file provided.'})
     
     file = request.files['resume']
-    return handle_resume_upload(file)
+    return handle_resume_upload(file, background=True)
 
 
-def handle_resume_upload(file):
-    """Centralized resume upload handling"""
+def handle_resume_upload(file, background=False):
+    """Centralized resume upload handling; background uploads return 202 and are polled for completion"""
     if file.filename == '':
         return jsonify({'success': False, 'error': 'No selected file.'}) if request.is_json else redirect(url_for('main.index'))
     
@@ -71,14 +130,21 @@ def handle_resume_upload(file):
         file.save(filepath)
         logger.info(f"Resume uploaded: {filepath}")
         
-        # Consistent session storage
-        session['resume_path'] = filepath
+        if background:
+            # Respond now; the client polls check_analysis_status
+            task_id = start_resume_analysis(filepath)
+            session[SESSION_TASK_KEY] = task_id
+            return jsonify({
+                'success': True,
+                'task_id': task_id,
+                'message': 'Resume uploaded, analysis started'
+            }), 202
         
         # Analyze resume
-        resume_insights = job_assistant.set_resume(filepath)
+        resume_insights = get_job_assistant().set_resume(filepath)
         
-        # Store insights
-        session['resume_insights'] = json.dumps(resume_insights)
+        # Store path and insights together
+        store_resume_data(filepath, resume_insights)
         
         if request.is_json:
             return jsonify({
@@ -91,7 +157,7 @@ def handle_resume_upload(file):
     
     except Exception as e:
         logger.error(f"Resume upload error: {str(e)}")
-        if request.is_json:
+        if request.is_json or background:
             return jsonify({
                 'success': False,
                 'error': str(e)
@@ -125,29 +191,55 @@ def chat_interface():
 def check_analysis_status():
     """Check the status of resume analysis"""
     try:
-        filepath = session.get('resume_filepath')
+        task_id = request.args.get('task_id') or session.get(SESSION_TASK_KEY)
+        with _analysis_tasks_lock:
+            task = _analysis_tasks.get(task_id)
+        if task is not None:
+            filepath, start_time, future = task
+            if not future.done():
+                # If analysis has been running too long
+                if time.time() - start_time > ANALYSIS_TIMEOUT:
+                    return jsonify({
+                        'success': False,
+                        'error': 'Analysis timeout'
+                    })
+                return jsonify({
+                    'success': False,
+                    'message': 'Analysis in progress'
+                })
+            
+            with _analysis_tasks_lock:
+                claimed = _analysis_tasks.pop(task_id, None) is not None
+            if not claimed:
+                # A concurrent poll for the same task is storing its result
+                return jsonify({
+                    'success': False,
+                    'message': 'Analysis in progress'
+                })
+            session.pop(SESSION_TASK_KEY, None)
+            store_resume_data(filepath, future.result())
+        
+        filepath, resume_insights = get_resume_data()
         if not filepath:
             return jsonify({
                 'success': False,
                 'error': 'No resume found in session'
             })
             
+        # Failed analyses are stored with an "error" key
+        if resume_insights and "error" in resume_insights:
+            return jsonify({
+                'success': False,
+                'error': resume_insights['error']
+            })
+
         # Check if analysis results exist
-        insights_json = session.get('resume_insights')
-        if insights_json:
+        if resume_insights:
             return jsonify({
                 'success': True,
                 'message': 'Analysis complete'
             })
             
-        # If analysis has been running too long (over 30 seconds)
-        start_time = session.get('analysis_started', 0)
-        if time.time() - start_time > 30:
-            return jsonify({
-                'success': False,
-                'error': 'Analysis timeout'
-            })
-            
         return jsonify({
             'success': False,
             'message': 'Analysis in progress'
@@ -163,7 +255,7 @@ def check_analysis_status():
 
 
 @main_bp.route('/chat/message', methods=["POST"])
-def chat_message():
+async def chat_message():
     """Handle chat interactions."""
     chat_form = ChatForm()
 
@@ -176,7 +268,7 @@ def chat_message():
             query = chat_form.query.data
             
             # Use job assistant with current resume
-            response_data = job_assistant.process_query(query)
+            response_data = await get_job_assistant().aprocess_query(query)
 
             return jsonify({
                 "response": response_data.get("response"),
@@ -197,3 +289,33 @@ def chat_message():
     return jsonify({'error': 'Invalid form submission'}), 400
 
 
+@main_bp.route('/chat/stream', methods=["POST"])
+def chat_stream():
+    """Stream a chat response to the client as Server-Sent Events."""
+    chat_form = ChatForm()
+    if not chat_form.validate_on_submit():
+        return jsonify({'error': 'Invalid form submission'}), 400
+
+    filepath, _ = get_resume_data()
+    if not filepath:
+        return jsonify({'error': 'No resume loaded. Please upload your resume first.'}), 400
+
+    query = chat_form.query.data.strip()
+    job_assistant = get_job_assistant()
+    # Conversation history is kept per browser session
+    chat_id = session.setdefault(SESSION_CHAT_KEY, uuid.uuid4().hex)
+
+    def generate():
+        try:
+            for event in job_assistant.stream_query(query, chat_id):
+                yield f"data: {json.dumps(event)}\n\n"
+        except Exception as e:
+            logger.error(f"Chat stream error: {str(e)}")
+            yield f"data: {json.dumps({'done': True, 'error': str(e)})}\n\n"
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        # Stop proxies from buffering the stream
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
@@ -1,6 +1,8 @@
+import os
 from langchain_groq import ChatGroq
 from langchain.chains import ConversationChain
-from langchain.memory import ConversationBufferMemory
+from langchain.memory import ConversationBufferWindowMemory
+from agents.llm import CHAT_MEMORY_TURNS, LLM_TIMEOUT
 
 class ChatAgent:
     def __init__(self, temperature: float = 0.7, api_key: str = None):
@@ -20,11 +22,12 @@ class ChatAgent:
         self.llm = ChatGroq(
             temperature=temperature,
             groq_api_key=api_key,
-            model_name="llama3-70b-8192"  # Replace with the appropriate model as needed
+            model_name="llama3-70b-8192",  # Replace with the appropriate model as needed
+            request_timeout=LLM_TIMEOUT
         )
 
-        # Set up conversation memory and chain
-        self.memory = ConversationBufferMemory()
+        # Set up conversation memory and chain; only recent turns are resent so prompts stay bounded
+        self.memory = ConversationBufferWindowMemory(k=CHAT_MEMORY_TURNS)
         self.chain = ConversationChain(llm=self.llm, memory=self.memory)
 
     def process(self, query: str):
@@ -4,18 +4,36 @@ setup(
     name="job-search-assistant",
     version="0.1.0",
     packages=find_packages(),
+    package_data={'agents': ['data/*.txt']},
     install_requires=[
-        "flask",
+        "flask[async]",
+        "aiohttp",
         "flask-wtf",
+        "Flask-Session",
+        "orjson",
         "python-dotenv",
         "langchain",
         "openai",
         "pypdf2",
         "spacy",
         "requests",
-        "beautifulsoup4"
+        "numpy",
+        "selectolax"
     ],
     extras_require={
+        'embeddings': [
+            'sentence-transformers',
+            'sqlite-vec'
+        ],
+        'pdfium': [
+            'pypdfium2'
+        ],
+        'jit': [
+            'numba'
+        ],
+        'fast-cache': [
+            'zstandard'
+        ],
         'dev': [
             'pytest',
             'flake8',
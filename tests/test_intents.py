@@ -0,0 +1,20 @@
+from agents.intents import matched_intents
+
+
+def test_cover_letter_request_does_not_start_a_job_search():
+    assert matched_intents("Write a cover letter for this job") == ("cover_letter",)
+
+
+def test_research_words_do_not_start_a_crawl_next_to_another_intent():
+    assert matched_intents("What skills should I learn") == ("resume",)
+    assert matched_intents("Find python jobs and research the company") == ("job_search",)
+
+
+def test_skills_in_a_job_search_do_not_start_a_resume_analysis():
+    assert matched_intents("Find jobs that match my skills and experience") == ("job_search",)
+
+
+def test_single_intents_are_kept():
+    assert matched_intents("Review my resume") == ("resume",)
+    assert matched_intents("Research the history of Python") == ("research",)
+    assert matched_intents("Hello there") == ()
@@ -0,0 +1,59 @@
+import sqlite3
+import time
+from contextlib import closing
+
+from agents.store import ContentStore, content_key
+
+
+def _row_count(path):
+    with closing(sqlite3.connect(path)) as connection:
+        return connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+
+def test_round_trip(tmp_path):
+    store = ContentStore("letters", path=str(tmp_path / "cache.db"))
+    value = {"status": "success", "paragraphs": {"opening": "Hello"}, "scores": [1, 2.5]}
+
+    store.set("key", value)
+
+    assert store.get("key") == value
+    assert store.get("missing", "default") == "default"
+    # Namespaces sharing a file do not see each other's keys
+    assert ContentStore("searches", path=store.path).get("key") is None
+
+
+def test_expired_entries_are_missed_and_deleted(tmp_path, monkeypatch):
+    store = ContentStore("searches", path=str(tmp_path / "cache.db"))
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now)
+    store.set("old", ["listing"], expire=60)
+    store.set("kept", ["listing"])
+
+    monkeypatch.setattr(time, "time", lambda: now + 61)
+    assert store.get("old") is None
+    assert store.get("kept") == ["listing"]
+
+    store.set("new", ["listing"], expire=60)
+    assert _row_count(store.path) == 2
+
+
+def test_corrupt_entries_return_the_default(tmp_path):
+    store = ContentStore("letters", path=str(tmp_path / "cache.db"))
+    store.set("good", {"content": "good"})
+    with closing(sqlite3.connect(store.path)) as connection, connection:
+        connection.executemany(
+            "INSERT INTO entries (namespace, key, value, created_at, expires_at) VALUES (?, ?, ?, ?, NULL)",
+            [("letters", key, value, time.time()) for key, value in (
+                ("json", b'j{"content": '), ("zstd", b'z\x28\xb5\x2f'), ("unknown", b'x{}')
+            )]
+        )
+
+    assert store.get("json", "default") == "default"
+    assert store.get("zstd", "default") == "default"
+    assert store.get("unknown", "default") == "default"
+    assert store.get("good") == {"content": "good"}
+
+
+def test_content_key_separates_parts():
+    assert content_key("ab", "c") != content_key("a", "bc")
+    assert content_key("job", "resume") == content_key("job", "resume")